@@ -0,0 +1,157 @@
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+
+from .fake_server import TRELLO_PREFIX, FakeServer
+from .scenarios import SCENARIOS
+
+DEFAULT_SIZES = [100, 1000, 10000]
+# Client-side pacing is effectively disabled so the server's behaviour decides
+DEFAULT_CLIENT_RATE = 1000.0
+
+
+class ScriptFailed(Exception):
+    pass
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+def summarize(scenario: str, size: int, wall: float, records: List[Dict], ok: bool) -> Dict:
+    trello = [record for record in records if record['endpoint'].startswith(TRELLO_PREFIX + '/')]
+    llm = [record for record in records if record not in trello]
+    durations = sorted(record['duration'] for record in trello)
+    llm_durations = sorted(record['duration'] for record in llm)
+    endpoints = Counter(f"{record['method']} {record['endpoint']}" for record in records)
+    return {
+        'scenario': scenario,
+        'cards': size,
+        'ok': ok,
+        'wall_seconds': round(wall, 3),
+        'requests': len(trello),
+        'llm_requests': len(llm),
+        'p50_ms': round(percentile(durations, 0.5) * 1000, 1),
+        'p95_ms': round(percentile(durations, 0.95) * 1000, 1),
+        'llm_p50_ms': round(percentile(llm_durations, 0.5) * 1000, 1),
+        'llm_p95_ms': round(percentile(llm_durations, 0.95) * 1000, 1),
+        'throttled': sum(1 for record in records if record['status'] == 429),
+        'llm_throttled': sum(1 for record in llm if record['status'] == 429),
+        'errors': sum(1 for record in records if record['status'] >= 500),
+        'bytes': sum(record['bytes'] for record in records),
+        'endpoints': dict(endpoints.most_common())
+    }
+
+
+def print_row(result: Dict) -> None:
+    print(
+        f"{result['scenario']:<12} {result['cards']:>6} {result['requests']:>9} {result['llm_requests']:>6} "
+        f"{result['wall_seconds']:>8.2f} {result['p50_ms']:>7.1f} {result['p95_ms']:>7.1f} "
+        f"{result['throttled']:>5} {result['errors']:>5}  {'ok' if result['ok'] else 'FAILED'}"
+    )
+
+
+def run_scenario(server: FakeServer, name: str, size: int, workdir: str, env: Dict[str, str]) -> Dict:
+    """Seed the server, run the scenario's script and measure only that run."""
+    log_path = os.path.join(workdir, 'output.log')
+
+    def run(command: List[str]) -> None:
+        with open(log_path, 'a') as log:
+            returncode = subprocess.call([sys.executable] + command, cwd=workdir, env=env,
+                                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT)
+        if returncode != 0:
+            raise ScriptFailed(f"{os.path.basename(command[0])} exited with {returncode}")
+
+    server.reset()
+    env = {**env, 'TRELLO_CACHE_PATH': os.path.join(workdir, 'boards.sqlite3')}
+    try:
+        command = SCENARIOS[name](server, size, workdir, run)
+    except ScriptFailed as e:
+        print(f"Setup failed: {e}")
+        return summarize(name, size, 0.0, server.take_records(), False)
+    # Setup requests are not part of the measurement
+    server.take_records()
+
+    started = time.perf_counter()
+    ok = True
+    try:
+        run(command)
+    except ScriptFailed as e:
+        print(e)
+        ok = False
+    wall = time.perf_counter() - started
+    return summarize(name, size, wall, server.take_records(), ok)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Trello scripts against a local fake Trello and LLM API')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Numbers of cards to benchmark with')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS), help='Scenarios to run')
+    parser.add_argument('--latency', type=float, default=20.0, help='Milliseconds added to every Trello request')
+    parser.add_argument('--jitter', type=float, default=10.0, help='Up to this many random milliseconds added on top of the latency')
+    parser.add_argument('--llm-latency', type=float, default=300.0, help='Milliseconds added to every chat completion')
+    parser.add_argument('--rate-limit', type=int, default=None, help='Answer with 429 beyond this many Trello requests per 10 seconds')
+    parser.add_argument('--llm-capacity', type=int, default=None, help='Answer with 429 beyond this many chat completions in flight')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of Trello requests that fail with a 500')
+    parser.add_argument('--client-rate', type=float, default=DEFAULT_CLIENT_RATE, help='Requests per second the Trello clients pace themselves to')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency jitter and error injection')
+    parser.add_argument('--json', help='Also write the results, including per-endpoint counts, to this file')
+    parser.add_argument('--verbose', action='store_true', help='Print the busiest endpoints of every run')
+    args = parser.parse_args()
+
+    server = FakeServer(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        llm_latency=args.llm_latency / 1000,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        llm_capacity=args.llm_capacity
+    )
+    results = []
+    with server, tempfile.TemporaryDirectory(prefix='trello-bench-') as basedir:
+        env = {
+            **os.environ,
+            'TRELLO_API_URL': server.trello_url,
+            'TRELLO_KEY': 'bench',
+            'TRELLO_TOKEN': 'bench',
+            'TRELLO_RATE_LIMIT': str(args.client_rate),
+            'OPENAI_BASE_URL': server.openai_url,
+            'OPENAI_API_KEY': 'bench',
+            'PYTHONUNBUFFERED': '1'
+        }
+        print(f"Fake API listening on {server.url}\n")
+        print(f"{'scenario':<12} {'cards':>6} {'requests':>9} {'llm':>6} {'wall s':>8} {'p50 ms':>7} {'p95 ms':>7} {'429':>5} {'5xx':>5}")
+        for size in args.sizes:
+            for name in args.scenarios:
+                workdir = tempfile.mkdtemp(prefix=f'{name}-{size}-', dir=basedir)
+                result = run_scenario(server, name, size, workdir, env)
+                results.append(result)
+                print_row(result)
+                if args.verbose:
+                    for endpoint, count in list(result['endpoints'].items())[:5]:
+                        print(f"    {count:>7}  {endpoint}")
+                if not result['ok']:
+                    with open(os.path.join(workdir, 'output.log')) as log:
+                        print(''.join(log.readlines()[-20:]))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    if not all(result['ok'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
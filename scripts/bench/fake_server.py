@@ -0,0 +1,571 @@
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# Path prefixes the two stand-ins are served under
+TRELLO_PREFIX = '/1'
+OPENAI_PREFIX = '/v1'
+LLM_DECISIONS = ['INBOX', 'UNCERTAIN', 'ARCHIVE']
+POS_STEP = 16384
+
+
+class NotFound(Exception):
+    pass
+
+
+class FakeTrello:
+    """In-memory Trello state implementing the endpoints the scripts use.
+
+    Mutations of cards and lists are recorded as board actions, so delta
+    syncs of the board cache behave as they would against Trello.
+    """
+
+    def __init__(self):
+        self.boards: Dict[str, Dict] = {}
+        self.lists: Dict[str, Dict] = {}
+        self.cards: Dict[str, Dict] = {}
+        self.checklists: Dict[str, Dict] = {}
+        self.attachments: Dict[str, List[Dict]] = {}
+        self.actions: List[Dict] = []
+        # Children indexed by parent so nothing scans every card per request
+        self._cards_by_list: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        self._checklists_by_card: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        self._max_pos: Dict[str, float] = defaultdict(float)
+        self.lock = threading.RLock()
+        self._counter = itertools.count()
+        self.routes = [
+            ('GET', '/members/me/boards', self.get_boards),
+            ('GET', '/boards/{id}', self.get_board),
+            ('GET', '/boards/{id}/cards', self.get_board_cards),
+            ('GET', '/boards/{id}/lists', self.get_board_lists),
+            ('GET', '/boards/{id}/actions', self.get_board_actions),
+            ('POST', '/lists', self.create_list),
+            ('GET', '/lists/{id}', self.get_list),
+            ('GET', '/lists/{id}/cards', self.get_list_cards),
+            ('PUT', '/lists/{id}/closed', self.close_list),
+            ('POST', '/cards', self.create_card),
+            ('GET', '/cards/{id}', self.get_card),
+            ('PUT', '/cards/{id}', self.update_card),
+            ('DELETE', '/cards/{id}', self.delete_card),
+            ('GET', '/cards/{id}/checklists', self.get_card_checklists),
+            ('POST', '/cards/{id}/attachments', self.add_attachment),
+            ('PUT', '/cards/{card}/checkItem/{id}', self.update_check_item),
+            ('POST', '/checklists', self.create_checklist),
+            ('DELETE', '/checklists/{id}', self.delete_checklist),
+            ('POST', '/checklists/{id}/checkItems', self.add_check_item),
+            ('DELETE', '/checklists/{checklist}/checkItems/{id}', self.delete_check_item),
+            ('GET', '/batch', self.batch),
+        ]
+        self._patterns = [
+            (method, template, re.compile('^' + re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', template) + '$'), handler)
+            for method, template, handler in self.routes
+        ]
+
+    def new_id(self) -> str:
+        # Like Trello's, ids start with a timestamp so they sort by age
+        return f'{int(time.time()):08x}{next(self._counter):016x}'
+
+    def route(self, method: str, path: str) -> Tuple[str, Optional[Callable], Dict[str, str]]:
+        """Return the endpoint template, handler and path arguments for a request."""
+        for route_method, template, pattern, handler in self._patterns:
+            match = pattern.match(path)
+            if match and route_method == method:
+                return template, handler, match.groupdict()
+        return path, None, {}
+
+    def handle(self, method: str, path: str, params: Dict[str, str], upload: Optional[str] = None) -> Any:
+        _, handler, args = self.route(method, path)
+        if handler is None:
+            raise NotFound(path)
+        with self.lock:
+            return handler(params=params, upload=upload, **args)
+
+    # Seeding
+
+    def add_board(self, name: str) -> Dict:
+        board = {'id': self.new_id(), 'name': name, 'closed': False}
+        self.boards[board['id']] = board
+        return board
+
+    def add_list(self, board_id: str, name: str, pos: Optional[float] = None) -> Dict:
+        lst = {
+            'id': self.new_id(), 'name': name, 'idBoard': board_id, 'closed': False,
+            'pos': self._place(board_id, pos, lambda: self._open_lists(board_id))
+        }
+        self.lists[lst['id']] = lst
+        self._act('createList', board_id, list=lst)
+        return lst
+
+    def add_card(self, list_id: str, name: str, desc: str = '', pos: Optional[float] = None) -> Dict:
+        board_id = self.lists[list_id]['idBoard']
+        card = {
+            'id': self.new_id(), 'name': name, 'desc': desc, 'idList': list_id, 'idBoard': board_id,
+            'pos': self._place(list_id, pos, lambda: self._open_cards(list_id)), 'closed': False,
+            'dateLastActivity': self._now(), 'labels': [], 'shortUrl': ''
+        }
+        card['shortUrl'] = f'https://trello.com/c/{card["id"][-8:]}'
+        self.cards[card['id']] = card
+        self._cards_by_list[list_id][card['id']] = card
+        self._act('createCard', board_id, card=card)
+        return card
+
+    def add_checklist(self, card_id: str, name: str, items: Optional[List[str]] = None, pos: Optional[float] = None) -> Dict:
+        checklist = {
+            'id': self.new_id(), 'name': name, 'idCard': card_id, 'idBoard': self.cards[card_id]['idBoard'],
+            'pos': self._place(card_id, pos, lambda: self._card_checklists(card_id)), 'checkItems': []
+        }
+        self.checklists[checklist['id']] = checklist
+        self._checklists_by_card[card_id][checklist['id']] = checklist
+        for item in items or []:
+            self._new_check_item(checklist, item)
+        return checklist
+
+    # Boards
+
+    def get_boards(self, params: Dict, **_) -> List[Dict]:
+        return [self._project(board, params.get('fields')) for board in self.boards.values()]
+
+    def get_board(self, id: str, params: Dict, **_) -> Dict:
+        board = self._project(self._get(self.boards, id), params.get('fields'))
+        if params.get('lists') in ('open', 'all'):
+            board['lists'] = [self._project(lst, params.get('list_fields')) for lst in self._open_lists(id)]
+        if params.get('cards') in ('open', 'all', 'visible'):
+            board['cards'] = []
+            for card in (card for card in self.cards.values() if card['idBoard'] == id and not card['closed']):
+                projected = self._project(card, params.get('card_fields'))
+                if params.get('card_attachments') == 'true':
+                    projected['attachments'] = [
+                        self._project(attachment, params.get('card_attachment_fields'))
+                        for attachment in self.attachments.get(card['id'], [])
+                    ]
+                board['cards'].append(projected)
+        if params.get('checklists') == 'all':
+            board['checklists'] = [self._copy(checklist) for checklist in self.checklists.values() if checklist['idBoard'] == id]
+        return board
+
+    def get_board_cards(self, id: str, params: Dict, **_) -> List[Dict]:
+        self._get(self.boards, id)
+        cards = [card for card in self.cards.values() if card['idBoard'] == id and not card['closed']]
+        return [self._project(card, params.get('fields')) for card in cards]
+
+    def get_board_lists(self, id: str, params: Dict, **_) -> List[Dict]:
+        self._get(self.boards, id)
+        return [self._project(lst, params.get('fields')) for lst in self._open_lists(id)]
+
+    def get_board_actions(self, id: str, params: Dict, **_) -> List[Dict]:
+        types = set(params['filter'].split(',')) if params.get('filter') else None
+        since = params.get('since')
+        actions = [
+            action for action in self.actions
+            if action['idBoard'] == id and (types is None or action['type'] in types) and (not since or action['id'] > since)
+        ]
+        # Newest first, like Trello
+        return [self._copy(action) for action in reversed(actions)][:int(params.get('limit', 50))]
+
+    # Lists
+
+    def create_list(self, params: Dict, **_) -> Dict:
+        board_id = params['idBoard']
+        self._get(self.boards, board_id)
+        return self._copy(self.add_list(board_id, params['name'], params.get('pos')))
+
+    def get_list(self, id: str, params: Dict, **_) -> Dict:
+        return self._project(self._get(self.lists, id), params.get('fields'))
+
+    def get_list_cards(self, id: str, params: Dict, **_) -> List[Dict]:
+        self._get(self.lists, id)
+        cards = self._open_cards(id)
+        if params.get('before'):
+            cards = [card for card in cards if card['id'] < params['before']]
+        if params.get('limit'):
+            # The newest cards before the cursor, returned in list order
+            newest = sorted(cards, key=lambda card: card['id'], reverse=True)[:int(params['limit'])]
+            cards = sorted(newest, key=lambda card: card['pos'])
+        cards = [self._project(card, params.get('fields')) for card in cards]
+        if params.get('checklists') == 'all':
+            for card in cards:
+                card['checklists'] = [self._copy(checklist) for checklist in self._card_checklists(card['id'])]
+        return cards
+
+    def close_list(self, id: str, params: Dict, **_) -> Dict:
+        lst = self._get(self.lists, id)
+        lst['closed'] = params.get('value', 'true') == 'true'
+        self._act('updateList', lst['idBoard'], list=lst)
+        return self._copy(lst)
+
+    # Cards
+
+    def create_card(self, params: Dict, upload: Optional[str] = None, **_) -> Dict:
+        list_id = params['idList']
+        self._get(self.lists, list_id)
+        card = self.add_card(list_id, params.get('name', ''), params.get('desc', ''), params.get('pos'))
+        if upload is not None:
+            self._new_attachment(card['id'], upload)
+        return self._copy(card)
+
+    def get_card(self, id: str, params: Dict, **_) -> Dict:
+        card = self._project(self._get(self.cards, id), params.get('fields'))
+        if params.get('attachments') == 'true':
+            card['attachments'] = [self._copy(attachment) for attachment in self.attachments.get(id, [])]
+        if params.get('checklists') == 'all':
+            card['checklists'] = [self._copy(checklist) for checklist in self._card_checklists(id)]
+        if params.get('actions'):
+            card['actions'] = []
+        return card
+
+    def update_card(self, id: str, params: Dict, **_) -> Dict:
+        card = self._get(self.cards, id)
+        if 'idList' in params:
+            card['idBoard'] = self._get(self.lists, params['idList'])['idBoard']
+            del self._cards_by_list[card['idList']][id]
+            card['idList'] = params['idList']
+            self._cards_by_list[card['idList']][id] = card
+        for field in ('name', 'desc'):
+            if field in params:
+                card[field] = params[field]
+        if 'closed' in params:
+            card['closed'] = params['closed'] == 'true'
+        if 'pos' in params:
+            card['pos'] = self._place(card['idList'], params['pos'], lambda: self._open_cards(card['idList']))
+        card['dateLastActivity'] = self._now()
+        self._act('updateCard', card['idBoard'], card=card)
+        return self._copy(card)
+
+    def delete_card(self, id: str, **_) -> Dict:
+        card = self.cards.pop(self._get(self.cards, id)['id'])
+        del self._cards_by_list[card['idList']][id]
+        self._act('deleteCard', card['idBoard'], card=card)
+        return {}
+
+    def get_card_checklists(self, id: str, **_) -> List[Dict]:
+        self._get(self.cards, id)
+        return [self._copy(checklist) for checklist in self._card_checklists(id)]
+
+    def add_attachment(self, id: str, upload: Optional[str] = None, **_) -> Dict:
+        self._get(self.cards, id)
+        return self._copy(self._new_attachment(id, upload or 'file'))
+
+    # Checklists
+
+    def create_checklist(self, params: Dict, **_) -> Dict:
+        card_id = params['idCard']
+        self._get(self.cards, card_id)
+        return self._copy(self.add_checklist(card_id, params.get('name', 'Checklist'), pos=params.get('pos')))
+
+    def delete_checklist(self, id: str, **_) -> Dict:
+        checklist = self.checklists.pop(self._get(self.checklists, id)['id'])
+        del self._checklists_by_card[checklist['idCard']][id]
+        return {}
+
+    def add_check_item(self, id: str, params: Dict, **_) -> Dict:
+        checklist = self._get(self.checklists, id)
+        return self._copy(self._new_check_item(checklist, params.get('name', ''), params.get('pos')))
+
+    def update_check_item(self, card: str, id: str, params: Dict, **_) -> Dict:
+        for checklist in self._card_checklists(card):
+            for item in checklist['checkItems']:
+                if item['id'] == id:
+                    if 'pos' in params:
+                        item['pos'] = self._place(checklist['id'], params['pos'], lambda: checklist['checkItems'])
+                    for field in ('name', 'state'):
+                        if field in params:
+                            item[field] = params[field]
+                    return self._copy(item)
+        raise NotFound(id)
+
+    def delete_check_item(self, checklist: str, id: str, **_) -> Dict:
+        items = self._get(self.checklists, checklist)['checkItems']
+        if not any(item['id'] == id for item in items):
+            raise NotFound(id)
+        items[:] = [item for item in items if item['id'] != id]
+        return {}
+
+    # Batch
+
+    def batch(self, params: Dict, **_) -> List[Dict]:
+        results = []
+        for url in params.get('urls', '').split(','):
+            parts = urlsplit(url)
+            try:
+                results.append({'200': self.handle('GET', parts.path, dict(parse_qsl(parts.query)))})
+            except NotFound:
+                results.append({'404': {'message': 'The requested resource was not found.'}})
+        return results
+
+    # Helpers
+
+    def _act(self, action_type: str, board_id: str, **objects) -> None:
+        data = {name: {'id': obj['id'], 'name': obj.get('name')} for name, obj in objects.items()}
+        self.actions.append({'id': self.new_id(), 'idBoard': board_id, 'type': action_type, 'date': self._now(), 'data': data})
+
+    def _new_check_item(self, checklist: Dict, name: str, pos: Any = None) -> Dict:
+        item = {
+            'id': self.new_id(), 'name': name, 'idChecklist': checklist['id'], 'state': 'incomplete',
+            'pos': self._place(checklist['id'], pos, lambda: checklist['checkItems'])
+        }
+        checklist['checkItems'].append(item)
+        return item
+
+    def _new_attachment(self, card_id: str, name: str) -> Dict:
+        attachment_id = self.new_id()
+        attachment = {'id': attachment_id, 'name': name, 'url': f'https://trello.com/attachments/{attachment_id}/{name}'}
+        self.attachments.setdefault(card_id, []).append(attachment)
+        return attachment
+
+    def _open_lists(self, board_id: str) -> List[Dict]:
+        lists = [lst for lst in self.lists.values() if lst['idBoard'] == board_id and not lst['closed']]
+        return sorted(lists, key=lambda lst: lst['pos'])
+
+    def _open_cards(self, list_id: str) -> List[Dict]:
+        cards = [card for card in self._cards_by_list[list_id].values() if not card['closed']]
+        return sorted(cards, key=lambda card: card['pos'])
+
+    def _card_checklists(self, card_id: str) -> List[Dict]:
+        return sorted(self._checklists_by_card[card_id].values(), key=lambda checklist: checklist['pos'])
+
+    def _place(self, parent_id: str, pos: Any, siblings: Callable[[], List[Dict]]) -> float:
+        """Resolve a `pos` value (number, top or bottom) among a parent's children."""
+        if pos is None or pos == 'bottom':
+            value = self._max_pos[parent_id] + POS_STEP
+        elif pos == 'top':
+            value = min((sibling['pos'] for sibling in siblings()), default=POS_STEP) / 2
+        else:
+            value = float(pos)
+        self._max_pos[parent_id] = max(self._max_pos[parent_id], value)
+        return value
+
+    @staticmethod
+    def _get(objects: Dict[str, Dict], object_id: str) -> Dict:
+        if object_id not in objects:
+            raise NotFound(object_id)
+        return objects[object_id]
+
+    @staticmethod
+    def _project(obj: Dict, fields: Optional[str]) -> Dict:
+        if not fields or fields == 'all':
+            return FakeTrello._copy(obj)
+        keep = {'id', *fields.split(',')}
+        return {key: value for key, value in FakeTrello._copy(obj).items() if key in keep}
+
+    @staticmethod
+    def _copy(obj: Any) -> Any:
+        return json.loads(json.dumps(obj))
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def chat_completion(body: Dict) -> Dict:
+    """Deterministic stand-in for an OpenAI chat completion.
+
+    Each note gets a label derived from its text; requests asking for a
+    JSON object get one label per numbered note.
+    """
+    content = body['messages'][-1]['content']
+    if body.get('response_format', {}).get('type') == 'json_object':
+        numbers = re.findall(r'^\[(\d+)\]$', content, re.MULTILINE)
+        answer = json.dumps({number: stub_decision(f'{content}:{number}') for number in numbers})
+    else:
+        answer = stub_decision(content)
+    return {
+        'id': f'chatcmpl-{abs(hash(content)) % 10 ** 12}',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': body.get('model', 'stub'),
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': answer}, 'finish_reason': 'stop'}],
+        'usage': {'prompt_tokens': len(content) // 4, 'completion_tokens': 2, 'total_tokens': len(content) // 4 + 2}
+    }
+
+
+def stub_decision(text: str) -> str:
+    return LLM_DECISIONS[sum(text.encode('utf-8')) % len(LLM_DECISIONS)]
+
+
+class FakeServer:
+    """Threaded local HTTP server fronting a FakeTrello and a stub LLM.
+
+    Trello is served under /1 and chat completions under /v1. Every request
+    waits `latency` (+ up to `jitter`) seconds, LLM calls `llm_latency`;
+    `error_rate` of Trello requests fail with a 500 before being applied, and
+    with `rate_limit` set, more than that many Trello requests in any
+    `rate_window` seconds are answered with a 429 and Retry-After. With
+    `llm_capacity` set, chat completions beyond that many in flight get a 429.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, llm_latency: float = 0.0,
+                 rate_limit: Optional[int] = None, rate_window: float = 10.0, error_rate: float = 0.0,
+                 seed: int = 0, llm_capacity: Optional[int] = None, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.llm_latency = llm_latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.error_rate = error_rate
+        self.llm_capacity = llm_capacity
+        self.trello = FakeTrello()
+        self.records: List[Dict] = []
+        self._random = random.Random(seed)
+        self._recent: deque = deque()
+        self._llm_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def trello_url(self) -> str:
+        return self.url + TRELLO_PREFIX
+
+    @property
+    def openai_url(self) -> str:
+        return self.url + OPENAI_PREFIX
+
+    def start(self) -> 'FakeServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'FakeServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        """Start over with an empty Trello and no recorded requests."""
+        with self._lock:
+            self.trello = FakeTrello()
+            self.records = []
+            self._recent.clear()
+
+    def take_records(self) -> List[Dict]:
+        """Return and clear the requests recorded so far."""
+        with self._lock:
+            records, self.records = self.records, []
+            return records
+
+    def respond(self, method: str, raw_path: str, body: bytes, content_type: str) -> Tuple[int, Dict[str, str], Any, str]:
+        """Return the status, extra headers, payload and endpoint for one request."""
+        parts = urlsplit(raw_path)
+        if parts.path.startswith(OPENAI_PREFIX + '/'):
+            endpoint = parts.path
+            if parts.path != OPENAI_PREFIX + '/chat/completions' or method != 'POST':
+                return 404, {}, {'error': {'message': 'Not found'}}, endpoint
+            with self._lock:
+                overloaded = self.llm_capacity is not None and self._llm_in_flight >= self.llm_capacity
+                if not overloaded:
+                    self._llm_in_flight += 1
+            if overloaded:
+                return 429, {'retry-after-ms': '100'}, {'error': {'message': 'Rate limit reached', 'type': 'requests'}}, endpoint
+            try:
+                self._sleep(self.llm_latency)
+            finally:
+                with self._lock:
+                    self._llm_in_flight -= 1
+            return 200, {}, chat_completion(json.loads(body or b'{}')), endpoint
+
+        path = parts.path[len(TRELLO_PREFIX):] if parts.path.startswith(TRELLO_PREFIX + '/') else parts.path
+        trello = self.trello
+        endpoint = f'{TRELLO_PREFIX}{trello.route(method, path)[0]}'
+        self._sleep(self.latency)
+        retry_after = self._throttle()
+        if retry_after is not None:
+            return 429, {'Retry-After': str(retry_after)}, 'API_TOKEN_LIMIT_EXCEEDED', endpoint
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+        if failed:
+            return 500, {}, 'Internal Server Error', endpoint
+
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        upload = None
+        if content_type.startswith('multipart/form-data'):
+            match = re.search(rb'filename="([^"]*)"', body)
+            upload = match.group(1).decode('utf-8', 'replace') if match else 'file'
+        try:
+            return 200, {}, trello.handle(method, path, params, upload), endpoint
+        except NotFound:
+            return 404, {}, 'The requested resource was not found.', endpoint
+        except (KeyError, ValueError) as e:
+            return 400, {}, f'invalid value for {e}', endpoint
+
+    def record(self, method: str, endpoint: str, status: int, duration: float, size: int) -> None:
+        with self._lock:
+            self.records.append({'method': method, 'endpoint': endpoint, 'status': status, 'duration': duration, 'bytes': size})
+
+    def _sleep(self, seconds: float) -> None:
+        if self.jitter:
+            with self._lock:
+                seconds += self._random.random() * self.jitter
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _throttle(self) -> Optional[int]:
+        if not self.rate_limit:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= self.rate_window:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate_limit:
+                return max(1, int(self.rate_window - (now - self._recent[0]) + 0.999))
+            self._recent.append(now)
+            return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this every response
+    # on a keep-alive connection stalls on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self._handle('GET')
+
+    def do_POST(self) -> None:
+        self._handle('POST')
+
+    def do_PUT(self) -> None:
+        self._handle('PUT')
+
+    def do_DELETE(self) -> None:
+        self._handle('DELETE')
+
+    def _handle(self, method: str) -> None:
+        started = time.perf_counter()
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        fake: FakeServer = self.server.fake
+        status, headers, payload, endpoint = fake.respond(method, self.path, body, self.headers.get('Content-Type', ''))
+        if isinstance(payload, str):
+            data, content_type = payload.encode('utf-8'), 'text/plain; charset=utf-8'
+        else:
+            data, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        fake.record(method, endpoint, status, time.perf_counter() - started, len(data))
+
+    def log_message(self, format: str, *args) -> None:
+        pass
@@ -0,0 +1,142 @@
+import json
+import os
+import shutil
+import string
+from typing import Callable, Dict, List
+
+from .fake_server import FakeServer, FakeTrello
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INBOX_LISTS = ['inbox', 'culled for upcoming week', 'deferred', 'archive']
+# Cards per topic list in the merge scenario
+TOPIC_LIST_SIZE = 50
+# Every n-th card gets a checklist
+CHECKLIST_EVERY = 5
+TASKS_PER_PHASE = 9
+SUBTASKS_PER_TASK = 3
+
+PRIORITIES = {
+    'year': ['Ship the new product', 'Get fit'],
+    'short-term': ['Prepare the quarterly review'],
+    'context': ['Works as a software engineer'],
+    'explanations': {'INBOX': 'Relevant now', 'UNCERTAIN': 'Unclear', 'ARCHIVE': 'Not relevant'}
+}
+
+
+def letters(index: int) -> str:
+    """Spreadsheet-style name for an index (a, b, ..., z, aa, ...) without digits."""
+    name = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = string.ascii_lowercase[remainder] + name
+    return name
+
+
+def seed_inbox_board(trello: FakeTrello) -> Dict[str, Dict]:
+    """Create the inbox board and its standard lists, keyed by list name."""
+    board = trello.add_board('inbox')
+    return {name: trello.add_list(board['id'], name) for name in INBOX_LISTS}
+
+
+def seed_cards(trello: FakeTrello, list_id: str, count: int, offset: int = 0) -> None:
+    for index in range(offset, offset + count):
+        card = trello.add_card(list_id, f'Note {letters(index)}', f'Captured thought number {index} about topic {index % 37}.')
+        if index % CHECKLIST_EVERY == 0:
+            trello.add_checklist(card['id'], 'Todo', [f'Step {step}' for step in range(3)])
+
+
+def project_plan(size: int) -> Dict:
+    """A project plan with roughly `size` cards."""
+    phases = max(1, size // (TASKS_PER_PHASE + 1))
+    return {
+        'name': 'Benchmark project',
+        'description': 'Synthetic project plan',
+        'phases': [
+            {
+                'name': f'Phase {phase}',
+                'description': f'Phase {phase} description',
+                'tasks': [
+                    {
+                        'name': f'Task {phase}.{task}',
+                        'description': f'Task {phase}.{task} description',
+                        'subtasks': [f'Subtask {phase}.{task}.{subtask}' for subtask in range(SUBTASKS_PER_TASK)]
+                    }
+                    for task in range(TASKS_PER_PHASE)
+                ]
+            }
+            for phase in range(phases)
+        ]
+    }
+
+
+def write_json(path: str, data: Dict) -> None:
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def script(name: str) -> str:
+    return os.path.join(SCRIPTS_DIR, name)
+
+
+# Each scenario seeds the server for `size` cards, may run unmeasured setup
+# steps through `run`, and returns the command line of the measured run
+
+def merge(server: FakeServer, size: int, workdir: str, run: Callable[[List[str]], None]) -> List[str]:
+    lists = seed_inbox_board(server.trello)
+    board_id = lists['inbox']['idBoard']
+    for offset in range(0, size, TOPIC_LIST_SIZE):
+        topic = server.trello.add_list(board_id, f'topic {letters(offset // TOPIC_LIST_SIZE)}')
+        seed_cards(server.trello, topic['id'], min(TOPIC_LIST_SIZE, size - offset), offset)
+    return [script('merge_trello_cards.py'), '--no-cache', '--jobs', '4']
+
+
+def plan(server: FakeServer, size: int, workdir: str, run: Callable[[List[str]], None]) -> List[str]:
+    seed_inbox_board(server.trello)
+    write_json(os.path.join(workdir, 'plan.json'), project_plan(size))
+    return [script('create_project_plan.py'), 'plan.json', '--no-cache']
+
+
+def plan_sync(server: FakeServer, size: int, workdir: str, run: Callable[[List[str]], None]) -> List[str]:
+    run(plan(server, size, workdir, run))
+    # A typical edit: a few descriptions reworded and subtasks added
+    data = project_plan(size)
+    for phase in data['phases'][::10]:
+        phase['tasks'][0]['description'] += ' (revised)'
+        phase['tasks'][1]['subtasks'].append('Follow-up')
+    write_json(os.path.join(workdir, 'plan.json'), data)
+    return [script('create_project_plan.py'), 'plan.json', '--no-cache', '--sync']
+
+
+def sorter(server: FakeServer, size: int, workdir: str, run: Callable[[List[str]], None]) -> List[str]:
+    lists = seed_inbox_board(server.trello)
+    seed_cards(server.trello, lists['deferred']['id'], size)
+    write_json(os.path.join(workdir, 'priorities.json'), PRIORITIES)
+    shutil.copy(script('prompt.txt'), workdir)
+    return [script('llm_note_sorter.py'), '--no-cache', '--no-board-cache', '--batch-size', '10']
+
+
+def cache_full(server: FakeServer, size: int, workdir: str, run: Callable[[List[str]], None]) -> List[str]:
+    lists = seed_inbox_board(server.trello)
+    seed_cards(server.trello, lists['inbox']['id'], size)
+    return [script('bench/sync_board.py')]
+
+
+def cache_delta(server: FakeServer, size: int, workdir: str, run: Callable[[List[str]], None]) -> List[str]:
+    run(cache_full(server, size, workdir, run))
+    # One percent of the cards change between runs
+    trello = server.trello
+    with trello.lock:
+        for card_id in list(trello.cards)[::100]:
+            trello.update_card(card_id, params={'desc': 'edited'})
+    return [script('bench/sync_board.py')]
+
+
+SCENARIOS: Dict[str, Callable[..., List[str]]] = {
+    'merge': merge,
+    'plan': plan,
+    'plan-sync': plan_sync,
+    'sorter': sorter,
+    'cache-full': cache_full,
+    'cache-delta': cache_delta,
+}
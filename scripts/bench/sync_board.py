@@ -0,0 +1,23 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trello import BoardCache, NameResolver  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync a board into the local cache and report its size')
+    parser.add_argument('--board', default='inbox', help='Name of the board to sync')
+    args = parser.parse_args()
+
+    with BoardCache() as cache:
+        board_id = NameResolver(cache).resolve_board(args.board)
+        lists = cache.get_board_lists(board_id)
+        cards = cache.get_board_cards(board_id)
+    print(f"Synced {len(lists)} lists and {len(cards)} cards")
+
+
+if __name__ == "__main__":
+    main()
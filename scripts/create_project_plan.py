@@ -1,21 +1,38 @@
+import argparse
 import os
 import sys
-from typing import Dict, List
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from tqdm import tqdm
 from trello import (
-    get_trello_boards,
-    get_trello_board_lists,
+    BoardCache,
+    NameResolver,
+    Task,
+    TaskGraph,
+    add_profile_arguments,
+    enable_profiling_from_args,
+    get_default_client,
+    item_pos,
+    plan_positions,
 )
 from merge_trello_cards import (
+    MAX_DESC_LENGTH,
     create_trello_list,
     create_trello_card,
     create_checklist,
-    add_checklist_item
+    add_checklist_item,
+    delete_checklist
 )
 
 load_dotenv()
 
-def create_project_structure(board_id: str, project_data: Dict) -> None:
+# Checklists created from the plan; sync leaves any others on a card alone
+PLAN_CHECKLISTS = ("Tasks", "Subtasks")
+# Only what sync compares is fetched for the cards of the project list
+PROJECT_CARD_PARAMS = {'fields': 'name,desc,pos', 'checklists': 'all'}
+
+def create_project_structure(board_id: str, project_data: Dict, lists: Optional[List[Dict]] = None) -> bool:
     """
     Creates a full project structure from parsed PDF data.
     
@@ -37,62 +54,174 @@ def create_project_structure(board_id: str, project_data: Dict) -> None:
             }
         ]
     }
+    
+    Returns False if any write failed; parts below a failed write are skipped.
     """
-    # Create main project list
-    project_list = create_trello_list(board_id, project_data["name"])
+    cards = plan_cards(project_data)
     
-    # Create overview card
-    overview_card = create_trello_card(
-        project_list["id"],
-        "Project Overview",
-        project_data["description"]
-    )
+    # The plan is built as a tree of writes (list -> cards -> checklists ->
+    # items) so that everything not waiting on a parent runs in parallel;
+    # explicit positions keep cards and items in plan order
+    graph = TaskGraph()
+    project_list = graph.add(create_trello_list, board_id, project_data["name"], lists=lists)
+    for index, (name, description, checklist) in enumerate(cards):
+        card = graph.add(create_trello_card, name, description, item_pos(index), after=project_list)
+        if checklist:
+            add_new_checklist(graph, checklist, after=card)
     
-    # For each phase
-    for phase in project_data["phases"]:
-        phase_card = create_trello_card(
-            project_list["id"],
-            phase["name"],
-            phase["description"]
-        )
-        
-        # Create tasks checklist
-        tasks_checklist = create_checklist(phase_card["id"], "Tasks")
+    return run_plan(graph, "Creating project")
+
+def get_project_cards(list_id: str) -> List[Dict]:
+    """Cards of a project list with their checklists and items, all in board order."""
+    cards = get_default_client().get(f'/lists/{list_id}/cards', params=PROJECT_CARD_PARAMS)
+    for card in cards:
+        card["checklists"] = sorted(card.get("checklists", []), key=lambda checklist: checklist["pos"])
+        for checklist in card["checklists"]:
+            checklist["checkItems"] = sorted(checklist.get("checkItems", []), key=lambda item: item["pos"])
+    return sorted(cards, key=lambda card: card["pos"])
+
+def sync_project_structure(board_id: str, project_data: Dict, lists: List[Dict]) -> bool:
+    """
+    Brings an existing project list in line with project_data.
+    
+    `lists` are the board's open lists. Cards, checklists and items are
+    matched by name. Only what differs is written: missing ones are
+    created, changed descriptions updated, those out of order moved, and
+    cards no longer in the plan archived. Checklist items that are already
+    on the board keep their completion state.
+    """
+    project_list = next((lst for lst in lists if lst["name"] == project_data["name"]), None)
+    if project_list is None:
+        print(f"No list named '{project_data['name']}' yet, creating the whole project")
+        return create_project_structure(board_id, project_data, lists)
+    
+    # Only the project list is downloaded, not the whole board
+    cards = plan_cards(project_data)
+    unmatched = defaultdict(deque)
+    for card in get_project_cards(project_list["id"]):
+        unmatched[card["name"]].append(card)
+    existing = [unmatched[name].popleft() if unmatched[name] else None for name, _, _ in cards]
+    positions = plan_positions([card["pos"] if card else None for card in existing])
+    
+    graph = TaskGraph()
+    for (name, description, checklist), card, pos in zip(cards, existing, positions):
+        if card is None:
+            new_card = graph.add(create_trello_card, project_list["id"], name, description, pos)
+            if checklist:
+                add_new_checklist(graph, checklist, after=new_card)
+            continue
         
-        # Create detailed cards for each task
+        changes = {}
+        if pos is not None:
+            changes["pos"] = pos
+        # Over-long descriptions live in an attachment, so the card's own
+        # description never matches the plan
+        if card["desc"] != description and len(description) <= MAX_DESC_LENGTH:
+            changes["desc"] = description
+        if changes:
+            graph.add(update_card, card["id"], changes)
+        sync_checklist(graph, card, card["checklists"], checklist)
+    
+    # Whatever is left over has been removed from the plan
+    for card in (card for cards_by_name in unmatched.values() for card in cards_by_name):
+        graph.add(archive_card, card["id"])
+    
+    if not len(graph):
+        print("Project is already up to date")
+        return True
+    return run_plan(graph, "Syncing project")
+
+def plan_cards(project_data: Dict) -> List[Tuple[str, str, Optional[Tuple[str, List[str]]]]]:
+    """The cards of a project in list order, as (name, description, checklist)."""
+    cards = [("Project Overview", project_data["description"], None)]
+    for phase in project_data["phases"]:
+        cards.append((phase["name"], phase["description"], ("Tasks", [task["name"] for task in phase["tasks"]])))
         for task in phase["tasks"]:
-            # Add task to phase checklist
-            add_checklist_item(tasks_checklist["id"], task["name"])
-            
-            # Create detailed task card
-            task_card = create_trello_card(
-                project_list["id"],
-                task["name"],
-                task["description"]
-            )
-            
-            # Add subtasks as checklist
-            if task.get("subtasks"):
-                subtasks_checklist = create_checklist(task_card["id"], "Subtasks")
-                for subtask in task["subtasks"]:
-                    add_checklist_item(subtasks_checklist["id"], subtask)
+            subtasks = ("Subtasks", task["subtasks"]) if task.get("subtasks") else None
+            cards.append((task["name"], task["description"], subtasks))
+    return cards
+
+def add_new_checklist(graph: TaskGraph, checklist: Tuple[str, List[str]], after: Task) -> None:
+    """Add a checklist and its items to the graph below the card task `after`."""
+    name, items = checklist
+    new_checklist = graph.add(create_checklist, name, after=after)
+    for index, item in enumerate(items):
+        graph.add(add_checklist_item, item, item_pos(index), after=new_checklist)
+
+def sync_checklist(graph: TaskGraph, card: Dict, current: List[Dict], checklist: Optional[Tuple[str, List[str]]]) -> None:
+    """Add the writes that turn a card's plan checklist into `checklist`."""
+    wanted_name = checklist[0] if checklist else None
+    existing = next((cl for cl in current if cl["name"] == wanted_name), None)
+    # Only checklists the plan creates are touched; others were added by hand
+    for stale in current:
+        if stale["name"] in PLAN_CHECKLISTS and stale is not existing:
+            graph.add(delete_checklist, stale["id"])
+    if not checklist:
+        return
+    if existing is None:
+        new_checklist = graph.add(create_checklist, card["id"], wanted_name)
+        for index, item in enumerate(checklist[1]):
+            graph.add(add_checklist_item, item, item_pos(index), after=new_checklist)
+        return
+    
+    unmatched = defaultdict(deque)
+    for item in existing["checkItems"]:
+        unmatched[item["name"]].append(item)
+    items = [unmatched[name].popleft() if unmatched[name] else None for name in checklist[1]]
+    positions = plan_positions([item["pos"] if item else None for item in items])
+    for name, item, pos in zip(checklist[1], items, positions):
+        if item is None:
+            graph.add(add_checklist_item, existing["id"], name, pos)
+        elif pos is not None:
+            graph.add(move_checklist_item, card["id"], item["id"], pos)
+    for item in (item for items_by_name in unmatched.values() for item in items_by_name):
+        graph.add(delete_checklist_item, existing["id"], item["id"])
+
+def update_card(card_id: str, changes: Dict) -> Dict:
+    """Update fields of a card."""
+    return get_default_client().put(f'/cards/{card_id}', params=changes)
+
+def archive_card(card_id: str) -> Dict:
+    """Archive a card."""
+    return get_default_client().put(f'/cards/{card_id}', params={'closed': 'true'})
+
+def move_checklist_item(card_id: str, item_id: str, pos: float) -> Dict:
+    """Move a checklist item to a new position."""
+    return get_default_client().put(f'/cards/{card_id}/checkItem/{item_id}', params={'pos': pos})
+
+def delete_checklist_item(checklist_id: str, item_id: str) -> None:
+    """Delete an item from a checklist."""
+    get_default_client().delete(f'/checklists/{checklist_id}/checkItems/{item_id}')
+
+def run_plan(graph: TaskGraph, desc: str) -> bool:
+    """Run the writes of a plan with a progress bar and report failures."""
+    with tqdm(total=len(graph), desc=desc, unit="write") as progress:
+        failed = graph.run(on_done=lambda task: progress.update())
+    for task in failed:
+        print(f"Failed to {task.func.__name__.replace('_', ' ')} {task.args}: {task.error}")
+    return not failed
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: create-project-plan.py <project_data.json>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Create a Trello project structure from parsed project JSON')
+    parser.add_argument('json_file', help='Path to the project_data.json file')
+    parser.add_argument('--no-cache', action='store_true', help='Look up boards from the API instead of the local cache')
+    parser.add_argument('--sync', action='store_true', help='Update an existing project list to match the JSON instead of creating a new copy')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    enable_profiling_from_args(args)
 
-    json_file = sys.argv[1]
+    json_file = args.json_file
     if not os.path.exists(json_file):
         print(f"Error: File {json_file} not found")
         sys.exit(1)
 
     # Get target board
-    boards = get_trello_boards()
-    target_board = next((board for board in boards if board["name"].lower() == "inbox"), None)
-    
-    if not target_board:
-        print("Could not find inbox board")
+    source = get_default_client() if args.no_cache else BoardCache()
+    resolver = NameResolver(source)
+    try:
+        target_board_id = resolver.resolve_board("inbox")
+    except LookupError as e:
+        print(f"Could not find inbox board: {e}")
         sys.exit(1)
     
     # Load project data from JSON file
@@ -107,8 +236,17 @@ def main():
         print(f"Error reading file: {e}")
         sys.exit(1)
     
+    if args.sync:
+        if not sync_project_structure(target_board_id, project_data, source.get_board_lists(target_board_id)):
+            print("Project structure was only partially synced")
+            sys.exit(1)
+        print("Project structure synced successfully!")
+        return
+    
     # Create the project structure
-    create_project_structure(target_board["id"], project_data)
+    if not create_project_structure(target_board_id, project_data):
+        print("Project structure was only partially created")
+        sys.exit(1)
     print("Project structure created successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = 'llm_decision_cache.json'
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def prompt_key(prompt: str, model: str) -> str:
+    """Hash of the model name and fully formatted prompt."""
+    return hashlib.sha256(f'{model}\0{prompt}'.encode('utf-8')).hexdigest()
+
+
+def context_fingerprint(template: str, priorities: Dict) -> str:
+    """Hash of everything besides the note that shapes a decision."""
+    payload = template + '\0' + json.dumps(priorities, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_entries(path: str, fingerprint: str) -> List[Tuple[str, str]]:
+    """Key/value pairs saved by save_entries(), or none if the file is missing,
+    unreadable or was written for a different fingerprint."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if data.get('fingerprint') != fingerprint:
+        return []
+    return data.get('entries', [])
+
+
+def save_entries(path: str, fingerprint: str, entries: List[Tuple[str, str]]) -> None:
+    """Write entries atomically so an interrupted run can't corrupt the file."""
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'fingerprint': fingerprint, 'entries': entries}, f)
+    os.replace(temp_path, path)
+
+
+class DecisionCache:
+    """Persistent, size-bounded LRU cache of LLM decisions.
+
+    Entries are keyed by prompt_key(). The file also stores the context
+    fingerprint it was built with; if priorities.json or prompt.txt have
+    changed since, the old entries are dropped on load.
+    """
+
+    def __init__(self, fingerprint: str, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._load()
+
+    def _load(self) -> None:
+        # Entries are stored least recently used first
+        self._entries.update(load_entries(self.path, self.fingerprint))
+
+    def get(self, prompt: str, model: str) -> Optional[str]:
+        key = prompt_key(prompt, model)
+        decision = self._entries.get(key)
+        if decision is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return decision
+
+    def put(self, prompt: str, model: str, decision: str) -> None:
+        key = prompt_key(prompt, model)
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        save_entries(self.path, self.fingerprint, list(self._entries.items()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
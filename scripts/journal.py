@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class Journal:
+    """Append-only JSON-lines log of planned and completed mutations.
+
+    Every operation has a stable key, e.g. "move:<card id>". plan() is
+    written before the mutation is sent and complete() after it succeeds,
+    so a crashed run leaves a record of what finished and what may be half
+    done. Opening with resume=True replays the log; otherwise it is cleared.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self._planned: Dict[str, Dict] = {}
+        self._completed: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if resume:
+            self._replay()
+        elif os.path.exists(path):
+            print(f"Discarding unfinished journal {path} (pass --resume to continue it)")
+        self._file = open(path, 'a' if resume else 'w')
+        if resume and self._file.tell() > 0:
+            # Terminate a torn final line so the next record starts cleanly
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    continue
+                if record['status'] == 'planned':
+                    self._planned[record['key']] = record.get('details', {})
+                elif record['status'] == 'done':
+                    self._completed[record['key']] = record.get('result')
+
+    def _write(self, record: Dict) -> None:
+        record['time'] = time.time()
+        with self._lock:
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+
+    def is_done(self, key: str) -> bool:
+        return key in self._completed
+
+    def result(self, key: str, default: Any = None) -> Any:
+        return self._completed.get(key, default)
+
+    def details(self, key: str) -> Dict:
+        """Details recorded when the operation was planned."""
+        return self._planned.get(key, {})
+
+    def is_pending(self, key: str) -> bool:
+        """True if the operation was started but never completed."""
+        return key in self._planned and key not in self._completed
+
+    def pending(self) -> List[str]:
+        return [key for key in self._planned if key not in self._completed]
+
+    def plan(self, key: str, **details) -> None:
+        self._planned[key] = details
+        self._write({'key': key, 'status': 'planned', 'details': details})
+
+    def complete(self, key: str, result: Any = None) -> None:
+        self._completed[key] = result
+        self._write({'key': key, 'status': 'done', 'result': result})
+
+    def close(self) -> None:
+        self._file.close()
+
+    def finish(self) -> None:
+        """Close and delete the journal once the whole run has succeeded."""
+        self.close()
+        os.remove(self.path)
@@ -3,19 +3,28 @@ import json
 import os
 import argparse
 import asyncio
-import concurrent.futures
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from dotenv import load_dotenv
+import httpx
 import openai
 from tqdm import tqdm
-import requests
 
+from decision_cache import DecisionCache, context_fingerprint
+from journal import Journal
+from local_classifier import DecisionHistory, LocalClassifier
 from trello import (
-    get_trello_boards,
-    get_trello_board_cards,
-    move_trello_card_to_list,
-    get_trello_board_lists
+    AdaptiveConcurrency,
+    AsyncTrelloClient,
+    BoardCache,
+    DuplicateIndex,
+    NameResolver,
+    add_hook,
+    add_profile_arguments,
+    enable_profiling_from_args,
+    get_default_client,
+    remove_hook
 )
+from trello.instrument import httpx_event_hooks
 
 load_dotenv()
 
@@ -24,6 +33,23 @@ DEFERRED_LIST_NAME = 'deferred'
 INBOX_LIST_NAME = 'inbox'
 ARCHIVE_LIST_NAME = 'archive'
 UNCERTAIN_LIST_NAME = 'culled for upcoming week'
+MODEL = "gpt-3.5-turbo"
+DECISIONS = ['INBOX', 'UNCERTAIN', 'ARCHIVE']
+LLM_TIMEOUT = 30
+# Only the fields the classifier and summary need are downloaded
+CARD_FIELDS = 'name,desc,idList'
+JOURNAL_PATH = '.llm_note_sorter.journal.jsonl'
+NOTE_PLACEHOLDER = '\x00NOTE\x00'
+LLM_MAX_RETRIES = 3
+DEFAULT_LOCAL_THRESHOLD = 0.95
+
+# Sent as a second system message in batch requests, replacing the
+# template's single-label answer format
+BATCH_INSTRUCTIONS = (
+    'This request contains several separate notes, each introduced by its number in square brackets, '
+    'so do not answer with a single label. Categorize every note independently using the rules above and '
+    'respond ONLY with a JSON object mapping each note number to its label, for example {"1": "INBOX", "2": "ARCHIVE"}.'
+)
 
 def load_priorities() -> Dict:
     """Load priorities from priorities.json file."""
@@ -50,159 +76,554 @@ def format_prompt(template: str, priorities: Dict, note_text: str) -> str:
         explanations=explanation_text
     )
 
-def get_llm_decision(prompt: str) -> str:
+class PromptLayout:
+    """Prompt template split into a static system message and a per-note user message.
+
+    Everything before the paragraph holding {note_text} (instructions,
+    priorities, context, explanations) is rendered once per run and sent as
+    an identical system message on every request, so provider-side prompt
+    caching can reuse it; only the user message varies between notes.
+    """
+
+    def __init__(self, template: str, priorities: Dict):
+        rendered = format_prompt(template, priorities, NOTE_PLACEHOLDER)
+        before_note, _, self.note_suffix = rendered.partition(NOTE_PLACEHOLDER)
+        system_message, separator, self.note_prefix = before_note.rpartition('\n\n')
+        if not separator:
+            system_message, self.note_prefix = before_note, ''
+        self.system_message = system_message
+
+    def user_message(self, note_text: str) -> str:
+        return f"{self.note_prefix}{note_text}{self.note_suffix}"
+
+    def messages(self, user_message: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": self.system_message},
+            {"role": "user", "content": user_message}
+        ]
+
+    def batch_messages(self, note_texts: List[str]) -> List[Dict]:
+        """Messages asking for decisions on several numbered notes as one JSON object.
+
+        The template's text after the note (the single-label answer cue) is
+        left out, and the JSON contract follows the shared system message.
+        """
+        numbered_notes = '\n\n'.join(f"[{number}]\n{note_text}" for number, note_text in enumerate(note_texts, start=1))
+        return [
+            {"role": "system", "content": self.system_message},
+            {"role": "system", "content": BATCH_INSTRUCTIONS},
+            {"role": "user", "content": f"{self.note_prefix}{numbered_notes}"}
+        ]
+
+    def cache_key(self, user_message: str) -> str:
+        """Full prompt text, identical to format_prompt() for a single note."""
+        return f"{self.system_message}\n\n{user_message}"
+
+def create_llm_client(max_connections: int) -> openai.AsyncOpenAI:
+    """Create the OpenAI client shared by every classification in a run."""
+    http_client = httpx.AsyncClient(
+        timeout=LLM_TIMEOUT,
+        event_hooks=httpx_event_hooks('openai'),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    )
+    return openai.AsyncOpenAI(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        timeout=LLM_TIMEOUT,
+        max_retries=LLM_MAX_RETRIES,
+        http_client=http_client
+    )
+
+async def get_llm_decision(client: openai.AsyncOpenAI, messages: List[Dict]) -> str:
     """Call OpenAI API to get categorization decision."""
-    client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
-            {"role": "user", "content": prompt}
-        ],
+    response = await client.chat.completions.create(
+        model=MODEL,
+        messages=messages,
         max_tokens=10,
         temperature=0
     )
     
     return response.choices[0].message.content.strip()
 
-def move_trello_card_with_timeout(card_id: str, list_id: str, timeout: int = 30) -> bool:
-    """Move a card to a different list with timeout handling."""
-    url = f'https://api.trello.com/1/cards/{card_id}'
-    params = {
-        'idList': list_id,
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
+async def get_llm_batch_decisions(client: openai.AsyncOpenAI, messages: List[Dict], count: int) -> Dict[int, str]:
+    """Call OpenAI API once for a batch of notes and return the valid decisions by note number.
+
+    Notes whose decision is missing or not a known label are left out, so
+    the caller can fall back to classifying them individually.
+    """
+    response = await client.chat.completions.create(
+        model=MODEL,
+        messages=messages,
+        max_tokens=10 * count + 20,
+        temperature=0,
+        response_format={"type": "json_object"}
+    )
+    
     try:
-        response = requests.put(url, params=params, timeout=timeout)
-        response.raise_for_status()
+        raw_decisions = json.loads(response.choices[0].message.content)
+    except (TypeError, ValueError):
+        return {}
+    if not isinstance(raw_decisions, dict):
+        return {}
+    
+    decisions = {}
+    for number in range(1, count + 1):
+        decision = str(raw_decisions.get(str(number), '')).upper().strip()
+        if decision in DECISIONS:
+            decisions[number] = decision
+    return decisions
+
+async def move_trello_card_with_timeout(trello: AsyncTrelloClient, card_id: str, list_id: str, timeout: int = 30) -> bool:
+    """Move a card to a different list, returning False once retries are exhausted."""
+    try:
+        await trello.request('PUT', f'/cards/{card_id}', params={'idList': list_id}, timeout=timeout)
         return True
-    except (requests.exceptions.Timeout, requests.exceptions.RequestException):
+    except httpx.HTTPError:
         return False
 
-async def process_card_async(executor, card: Dict, prompt_template: str, priorities: Dict, list_mapping: Dict, dry_run: bool) -> Optional[Dict]:
-    """Process a single card asynchronously."""
+def build_note_text(card: Dict) -> str:
+    """Text of a card as presented to the LLM."""
     note_text = f"Title: {card['name']}"
     if card.get('desc'):
         note_text += f"\nDescription: {card['desc']}"
-    
-    prompt = format_prompt(prompt_template, priorities, note_text)
-    
-    try:
-        # Run LLM decision in thread pool
-        decision = await asyncio.get_event_loop().run_in_executor(
-            executor, get_llm_decision, prompt
-        )
+    return note_text
+
+class NoteClassifier:
+    """Classifies notes through one long-lived OpenAI client.
+
+    The client's connection pool is shared by every concurrent request and
+    an adaptive limit bounds how many requests are in flight at once.
+
+    With a trained LocalClassifier, notes it is at least `local_threshold`
+    confident about are decided without the LLM. In `shadow` mode its
+    predictions are only compared with the LLM's decisions. Every decision
+    the LLM makes is added to `history`, the local classifier's training data.
+    """
+
+    def __init__(
+        self,
+        client: openai.AsyncOpenAI,
+        concurrency: AdaptiveConcurrency,
+        layout: PromptLayout,
+        decision_cache: Optional[DecisionCache] = None,
+        history: Optional[DecisionHistory] = None,
+        local: Optional[LocalClassifier] = None,
+        local_threshold: float = DEFAULT_LOCAL_THRESHOLD,
+        shadow: bool = False
+    ):
+        self.client = client
+        self.layout = layout
+        self.decision_cache = decision_cache
+        self.concurrency = concurrency
+        self.history = history
+        self.local = local
+        self.local_threshold = local_threshold
+        self.shadow = shadow
+        self.local_decisions = 0
+        self.shadow_results: List[Dict] = []
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    async def classify_card(self, user_message: str, note_text: Optional[str] = None) -> str:
+        """Classify a single note, normalizing unknown answers to UNCERTAIN."""
+        async with self.concurrency:
+            decision = await get_llm_decision(self.client, self.layout.messages(user_message))
         decision = decision.upper().strip()
         
-        if decision not in ['INBOX', 'UNCERTAIN', 'ARCHIVE']:
-            decision = 'UNCERTAIN'
+        if decision not in DECISIONS:
+            return 'UNCERTAIN'
+        if self.decision_cache is not None:
+            self.decision_cache.put(self.layout.cache_key(user_message), MODEL, decision)
+        if self.history is not None and note_text is not None:
+            self.history.add(note_text, decision)
+        return decision
+
+    def classify_locally(self, results: List[Dict]) -> None:
+        """Decide the results the local classifier is confident about.
+
+        In shadow mode every prediction is kept on its result instead, to be
+        compared with the LLM's decision once it arrives.
+        """
+        predictions = self.local.predict([result['note_text'] for result in results])
+        for result, (decision, confidence) in zip(results, predictions):
+            if self.shadow:
+                result['local_prediction'] = (decision, confidence)
+                self.shadow_results.append(result)
+            elif confidence >= self.local_threshold:
+                result['decision'] = decision
+                result['local'] = True
+                self.local_decisions += 1
+
+    def local_summary(self) -> str:
+        """How many notes were decided locally, or in shadow mode how well the predictions matched."""
+        if not self.shadow:
+            return f"Local classifier: {self.local_decisions} cards decided without the LLM"
+        compared = [result for result in self.shadow_results if 'error' not in result]
+        confident = [result for result in compared if result['local_prediction'][1] >= self.local_threshold]
+        agreed = sum(1 for result in compared if result['local_prediction'][0] == result['decision'])
+        confident_agreed = sum(1 for result in confident if result['local_prediction'][0] == result['decision'])
+        return (
+            f"Shadow mode: local classifier agreed with the LLM on {agreed} of {len(compared)} cards; "
+            f"it was confident enough to decide {len(confident)} of them and agreed on {confident_agreed}"
+            + (f" ({confident_agreed / len(confident):.0%})" if confident else "")
+        )
+
+    async def classify_batch(self, cards: List[Dict]) -> List[Dict]:
+        """Classify a batch of cards, returning one result dict per card.
+
+        Cached decisions are reused and confident local predictions accepted;
+        the remaining cards are sent in a single request when there is more
+        than one, and any card the batch response does not cover is
+        classified individually.
+        """
+        results = []
+        for card in cards:
+            note_text = build_note_text(card)
+            user_message = self.layout.user_message(note_text)
+            cache_key = self.layout.cache_key(user_message)
+            decision = self.decision_cache.get(cache_key, MODEL) if self.decision_cache is not None else None
+            results.append({
+                'card': card,
+                'decision': decision,
+                'note_text': note_text,
+                'user_message': user_message,
+                'cache_key': cache_key,
+                'moved': False,
+                'cached': decision is not None
+            })
+            if decision is not None and self.history is not None:
+                self.history.add(note_text, decision)
         
-        result = {
-            'card': card,
-            'decision': decision,
-            'note_text': note_text,
-            'moved': False
-        }
+        if self.local:
+            uncached = [result for result in results if result['decision'] is None]
+            if uncached:
+                self.classify_locally(uncached)
         
-        if not dry_run:
-            # Run Trello API call in thread pool with timeout
-            if decision == 'INBOX':
-                target_list = list_mapping['inbox']
-            elif decision == 'ARCHIVE':
-                target_list = list_mapping['archive']
-            elif decision == 'UNCERTAIN':
-                target_list = list_mapping['uncertain']
-            
-            moved = await asyncio.get_event_loop().run_in_executor(
-                executor, move_trello_card_with_timeout, card['id'], target_list
-            )
-            result['moved'] = moved
+        pending = [result for result in results if result['decision'] is None]
+        if len(pending) > 1:
+            batch_messages = self.layout.batch_messages([result['note_text'] for result in pending])
+            try:
+                async with self.concurrency:
+                    batch_decisions = await get_llm_batch_decisions(self.client, batch_messages, len(pending))
+            except Exception as e:
+                print(f"Batch classification failed, falling back to single requests: {e}")
+                batch_decisions = {}
+            for number, result in enumerate(pending, start=1):
+                if number in batch_decisions:
+                    result['decision'] = batch_decisions[number]
+                    if self.decision_cache is not None:
+                        self.decision_cache.put(result['cache_key'], MODEL, result['decision'])
+                    if self.history is not None:
+                        self.history.add(result['note_text'], result['decision'])
         
-        return result
+        async def classify_single(result: Dict) -> None:
+            try:
+                result['decision'] = await self.classify_card(result['user_message'], result['note_text'])
+            except Exception as e:
+                print(f"Error processing card '{result['card']['name']}': {e}")
+                result['decision'] = 'UNCERTAIN'
+                result['error'] = str(e)
         
-    except Exception as e:
-        print(f"Error processing card '{card['name']}': {e}")
-        return {
+        await asyncio.gather(*(classify_single(result) for result in results if result['decision'] is None))
+        return results
+
+async def move_result_async(trello: AsyncTrelloClient, result: Dict, list_mapping: Dict, journal: Optional[Journal] = None) -> None:
+    """Move a classified card to the list for its decision."""
+    # Cards whose classification failed stay in the deferred list
+    if 'error' in result:
+        return
+    key = f"move:{result['card']['id']}"
+    if journal and journal.is_done(key):
+        result['moved'] = True
+        return
+    target_list = list_mapping[result['decision'].lower()]
+    if journal:
+        journal.plan(key, list_id=target_list)
+    result['moved'] = await move_trello_card_with_timeout(trello, result['card']['id'], target_list)
+    if journal and result['moved']:
+        journal.complete(key)
+
+async def classify_with_journal(classifier: NoteClassifier, cards: List[Dict], journal: Optional[Journal]) -> List[Dict]:
+    """Classify a batch, reusing decisions a previous run recorded in the journal."""
+    if journal is None:
+        return await classifier.classify_batch(cards)
+    
+    results = []
+    remaining = []
+    for card in cards:
+        key = f"classify:{card['id']}"
+        if journal.is_done(key):
+            results.append({
+                'card': card,
+                'decision': journal.result(key),
+                'note_text': build_note_text(card),
+                'moved': False,
+                'cached': True
+            })
+        else:
+            remaining.append(card)
+    
+    for result in await classifier.classify_batch(remaining):
+        if 'error' not in result:
+            journal.complete(f"classify:{result['card']['id']}", result['decision'])
+        results.append(result)
+    return results
+
+async def run_pipeline(card_pages: AsyncIterator[List[Dict]], trello: AsyncTrelloClient, classifier: NoteClassifier, list_mapping: Dict, args: argparse.Namespace, journal: Optional[Journal] = None) -> List[Dict]:
+    """Stream cards through fetch -> classify -> move stages.
+
+    Each stage has its own pool of workers and the stages are connected by
+    bounded queues, so classification starts with the first page of cards
+    and a slow stage applies backpressure to the ones before it. The worker
+    counts are only ceilings: the classifier's and the Trello client's
+    adaptive limits decide how many requests are actually in flight.
+
+    Near-duplicate cards are only classified once: the producer indexes
+    every card and holds back those matching an earlier card, which then
+    get that card's decision as soon as it is known.
+    """
+    batch_size = max(1, args.batch_size)
+    classify_workers = max(1, args.max_workers)
+    move_workers = max(1, args.move_workers)
+    card_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * classify_workers)
+    move_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * move_workers * batch_size)
+    results = []
+    progress = tqdm(desc="Processing cards", unit="card")
+    duplicates = DuplicateIndex(args.dedupe_threshold) if args.dedupe_threshold is not None else None
+    # Results of classified cards, and cards waiting for their near-duplicate's result
+    decided: Dict[str, Dict] = {}
+    followers: Dict[str, List[Dict]] = {}
+    
+    def follower_result(card: Dict, original: Dict) -> Dict:
+        result = {
             'card': card,
-            'decision': 'UNCERTAIN',
-            'note_text': note_text,
+            'decision': original['decision'],
+            'note_text': build_note_text(card),
             'moved': False,
-            'error': str(e)
+            'cached': False,
+            'duplicate_of': original['card']['id']
         }
+        if 'error' in original:
+            result['error'] = original['error']
+        return result
+    
+    async def produce() -> None:
+        async for page in card_pages:
+            if duplicates is not None:
+                representatives = duplicates.add_many([card['id'] for card in page], [build_note_text(card) for card in page])
+                unique = []
+                for card, representative in zip(page, representatives):
+                    if representative == card['id']:
+                        unique.append(card)
+                    elif representative in decided:
+                        await move_queue.put(follower_result(card, decided[representative]))
+                    else:
+                        followers.setdefault(representative, []).append(card)
+                page = unique
+            for start in range(0, len(page), batch_size):
+                await card_queue.put(page[start:start + batch_size])
+    
+    async def classify() -> None:
+        while (batch := await card_queue.get()) is not None:
+            for result in await classify_with_journal(classifier, batch, journal):
+                decided[result['card']['id']] = result
+                await move_queue.put(result)
+                for card in followers.pop(result['card']['id'], []):
+                    await move_queue.put(follower_result(card, result))
+    
+    async def move() -> None:
+        while (result := await move_queue.get()) is not None:
+            if not args.dry_run:
+                await move_result_async(trello, result, list_mapping, journal)
+            else:
+                print(f"Card: {result['card']['name'][:50]}... -> {result['decision']}" + (" (near-duplicate)" if 'duplicate_of' in result else ""))
+            results.append(result)
+            progress.update(1)
+    
+    async def finish_stage(workers: List[asyncio.Task], queue: asyncio.Queue, consumers: int) -> None:
+        # One sentinel per consumer tells the next stage its input is exhausted
+        await asyncio.gather(*workers)
+        for _ in range(consumers):
+            await queue.put(None)
+    
+    produce_task = asyncio.create_task(produce())
+    classify_tasks = [asyncio.create_task(classify()) for _ in range(classify_workers)]
+    move_tasks = [asyncio.create_task(move()) for _ in range(move_workers)]
+    tasks = [
+        produce_task, *classify_tasks, *move_tasks,
+        asyncio.create_task(finish_stage([produce_task], card_queue, classify_workers)),
+        asyncio.create_task(finish_stage(classify_tasks, move_queue, move_workers))
+    ]
+    try:
+        # A failed worker would leave its peers blocked on a full queue, so
+        # the first exception cancels every stage and is raised here
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        progress.close()
+    return results
 
 async def main_async():
     parser = argparse.ArgumentParser(description='LLM-assisted note sorting for Trello cards')
     parser.add_argument('--dry-run', action='store_true', help='Preview decisions without moving cards')
-    parser.add_argument('--max-workers', type=int, default=10, help='Maximum number of concurrent workers')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the LLM decision cache and the local classifier trained on it')
+    parser.add_argument('--no-board-cache', action='store_true', help='Read the board from the API instead of the local board cache')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run, reusing its recorded decisions and moves')
+    parser.add_argument('--batch-size', type=int, default=1, help='Number of cards to classify per LLM request')
+    parser.add_argument('--max-workers', type=int, default=32, help='Upper bound on concurrent LLM calls; the actual concurrency adapts to latency and rate limiting')
+    parser.add_argument('--move-workers', type=int, default=20, help='Upper bound on concurrent card moves (Trello requests); adapts like --max-workers')
+    parser.add_argument('--local-threshold', type=float, default=DEFAULT_LOCAL_THRESHOLD, help='Decide notes locally when the classifier trained on past LLM decisions is at least this confident')
+    parser.add_argument('--no-local', action='store_true', help='Send every note to the LLM instead of deciding confident ones with the local classifier')
+    parser.add_argument('--shadow', action='store_true', help='Send every note to the LLM and report how often the local classifier agreed')
+    parser.add_argument('--dedupe-threshold', type=float, default=None, help='Classify cards at least this similar (e.g. 0.8) only once; off by default')
+    parser.add_argument('--page-size', type=int, default=100, help='Number of cards fetched per page from the deferred list')
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    if args.shadow and args.no_cache:
+        parser.error('--shadow needs the decision history that --no-cache turns off')
+    enable_profiling_from_args(args)
     
     print("Loading priorities and prompt template...")
     priorities = load_priorities()
     prompt_template = load_prompt_template()
     
-    print("Getting Trello boards...")
-    boards = get_trello_boards()
-    inbox_board_id = None
-    for board in boards:
-        if board['name'] == INBOX_BOARD_NAME:
-            inbox_board_id = board['id']
-            break
-    
-    if not inbox_board_id:
-        print(f"Error: Could not find board named '{INBOX_BOARD_NAME}'")
+    # Lists are resolved before the journal is opened, so a missing board
+    # leaves an earlier run's journal untouched
+    cache = None if args.no_board_cache else BoardCache()
+    list_mapping = resolve_lists(cache)
+    if list_mapping is None:
+        return
+    
+    # Decisions are reused across runs until priorities or the prompt change,
+    # and past decisions train the local classifier under the same rule
+    decision_cache = None
+    history = None
+    local = None
+    if not args.no_cache:
+        fingerprint = context_fingerprint(prompt_template, priorities)
+        decision_cache = DecisionCache(fingerprint)
+        history = DecisionHistory(fingerprint)
+        if args.shadow or not args.no_local:
+            local = LocalClassifier()
+            if local.fit(history.items()):
+                print(f"Trained the local classifier on {len(history)} past decisions")
+            else:
+                print(f"Too few past decisions ({len(history)}) to train the local classifier; every note goes to the LLM")
+                local = None
+    
+    # Each backend gets its own AIMD limit, fed by the request events of its
+    # client, so a throttled OpenAI account doesn't slow down Trello or vice versa
+    llm_concurrency = AdaptiveConcurrency('openai', args.max_workers, timeout_errors=(openai.APITimeoutError,))
+    trello_concurrency = AdaptiveConcurrency('trello', args.move_workers)
+    add_hook(llm_concurrency)
+    add_hook(trello_concurrency)
+    
+    # One OpenAI client (and connection pool) is shared by every classification
+    classifier = NoteClassifier(
+        create_llm_client(args.max_workers),
+        llm_concurrency,
+        PromptLayout(prompt_template, priorities),
+        decision_cache,
+        history,
+        local,
+        args.local_threshold,
+        args.shadow
+    )
+    
+    # Dry runs change nothing, so there is nothing to resume
+    journal = None if args.dry_run else Journal(JOURNAL_PATH, resume=args.resume)
+    
+    completed = False
+    try:
+        async with AsyncTrelloClient(max_concurrency=args.move_workers, concurrency=trello_concurrency) as trello:
+            completed = await sort_deferred_cards(trello, classifier, args, cache, list_mapping, journal)
+    finally:
+        await classifier.aclose()
+        remove_hook(llm_concurrency)
+        remove_hook(trello_concurrency)
+        print(f"  {llm_concurrency}")
+        print(f"  {trello_concurrency}")
+        if journal and completed:
+            journal.finish()
+        elif journal:
+            journal.close()
+            print("  Run did not complete; rerun with --resume to continue where it stopped")
+        if decision_cache is not None:
+            decision_cache.save()
+            print(f"  LLM decision cache: {decision_cache.hits} hits, {decision_cache.misses} misses")
+        if history is not None:
+            history.save()
+        if local:
+            print(f"  {classifier.local_summary()}")
+
+async def iter_deferred_cards(trello: AsyncTrelloClient, cache: Optional[BoardCache], list_id: str, page_size: int) -> AsyncIterator[List[Dict]]:
+    """Yield the cards of the deferred list page by page, from the cache or the API."""
+    if cache is not None:
+        cards = cache.get_list_cards(list_id, fields=CARD_FIELDS)
+        for start in range(0, len(cards), page_size):
+            yield cards[start:start + page_size]
         return
+    async for page in trello.iter_list_cards(list_id, page_size, fields=CARD_FIELDS):
+        yield page
+
+def resolve_lists(cache: Optional[BoardCache]) -> Optional[Dict]:
+    """Ids of the deferred list and the decision target lists, or None if any is missing."""
+    # Board and list lookups only happen at startup, so a synchronous
+    # resolver over the cache (or the API with --no-board-cache) is sufficient
+    resolver = NameResolver(cache or get_default_client())
+    
+    print("Getting Trello boards...")
+    try:
+        inbox_board_id = resolver.resolve_board(INBOX_BOARD_NAME)
+    except LookupError as e:
+        print(f"Error: {e}")
+        return None
     
     print(f"Found inbox board: {inbox_board_id}")
     
     print("Getting board lists...")
-    lists = get_trello_board_lists(board_id=inbox_board_id)
-    
+    list_names = {
+        'deferred': DEFERRED_LIST_NAME,
+        'inbox': INBOX_LIST_NAME,
+        'archive': ARCHIVE_LIST_NAME,
+        'uncertain': UNCERTAIN_LIST_NAME
+    }
     list_mapping = {}
-    for lst in lists:
-        if lst['name'] == DEFERRED_LIST_NAME:
-            list_mapping['deferred'] = lst['id']
-        elif lst['name'] == INBOX_LIST_NAME:
-            list_mapping['inbox'] = lst['id']
-        elif lst['name'] == ARCHIVE_LIST_NAME:
-            list_mapping['archive'] = lst['id']
-        elif lst['name'] == UNCERTAIN_LIST_NAME:
-            list_mapping['uncertain'] = lst['id']
-    
-    required_lists = ['deferred', 'inbox', 'archive', 'uncertain']
-    missing_lists = [name for name in required_lists if name not in list_mapping]
+    missing_lists = []
+    for key, name in list_names.items():
+        try:
+            list_mapping[key] = resolver.resolve_list(inbox_board_id, name)
+        except LookupError as e:
+            missing_lists.append(str(e))
+    
     if missing_lists:
         print(f"Error: Could not find required lists: {missing_lists}")
-        return
-    
-    print("Getting cards from deferred list...")
-    board_cards = get_trello_board_cards(board_id=inbox_board_id)
-    deferred_cards = [card for card in board_cards if card['idList'] == list_mapping['deferred']]
+        return None
+    return list_mapping
+
+async def sort_deferred_cards(trello: AsyncTrelloClient, classifier: NoteClassifier, args: argparse.Namespace, cache: Optional[BoardCache], list_mapping: Dict, journal: Optional[Journal] = None) -> bool:
+    """Classify every card in the deferred list and move it to its target list.
+
+    Returns True when every card was handled, i.e. nothing is left to resume.
+    """
+    # Cards are classified and moved while later pages are still being fetched
+    print("Processing cards from deferred list...")
+    card_pages = iter_deferred_cards(trello, cache, list_mapping['deferred'], args.page_size)
+    results = await run_pipeline(card_pages, trello, classifier, list_mapping, args, journal)
     
-    if not deferred_cards:
+    if not results:
         print("No cards found in deferred list.")
-        return
-    
-    print(f"Found {len(deferred_cards)} cards to process...")
-    
-    # Process cards concurrently using thread pool
-    with concurrent.futures.ThreadPoolExecutor(max_workers=args.max_workers) as executor:
-        print("Processing cards concurrently...")
-        tasks = []
-        for card in deferred_cards:
-            task = process_card_async(executor, card, prompt_template, priorities, list_mapping, args.dry_run)
-            tasks.append(task)
-        
-        # Process all cards concurrently with progress bar
-        results = []
-        for coro in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Processing cards"):
-            result = await coro
-            if result:
-                results.append(result)
-                if args.dry_run:
-                    print(f"Card: {result['card']['name'][:50]}... -> {result['decision']}")
+        return True
     
     # Summary
+    duplicate_count = sum(1 for result in results if 'duplicate_of' in result)
+    if duplicate_count:
+        print(f"\n{duplicate_count} near-duplicate cards took the decision of an earlier card")
     if args.dry_run:
         print("\nDry run complete. Summary:")
         decision_counts = {}
@@ -213,9 +634,10 @@ async def main_async():
     else:
         moved_count = sum(1 for r in results if r.get('moved', False))
         failed_count = len(results) - moved_count
-        print(f"\nProcessing complete!")
+        print("\nProcessing complete!")
         print(f"  Successfully moved: {moved_count} cards")
         print(f"  Failed/timed out: {failed_count} cards (left in deferred list)")
+        print(f"  Trello API: {trello.stats}")
         
         if failed_count > 0:
             print("\nFailed cards:")
@@ -224,6 +646,8 @@ async def main_async():
                     card_name = result['card']['name'][:50]
                     reason = "timeout/error" if 'error' not in result else f"error: {result['error']}"
                     print(f"  - {card_name}... ({reason})")
+    
+    return all(result.get('moved', False) for result in results)
 
 def main():
     asyncio.run(main_async())
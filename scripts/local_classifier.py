@@ -0,0 +1,170 @@
+import math
+import re
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from decision_cache import load_entries, save_entries
+
+DEFAULT_HISTORY_PATH = 'llm_decision_history.json'
+DEFAULT_MAX_ENTRIES = 5000
+# Fewer past decisions than this, or only one label among them, leaves the
+# classifier untrained and every note goes to the LLM
+MIN_TRAINING_NOTES = 50
+MAX_FEATURES = 2048
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9'_-]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words plus adjacent word pairs."""
+    words = TOKEN_PATTERN.findall(text.lower())
+    return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+
+class DecisionHistory:
+    """Past LLM decisions with the note text they were made for.
+
+    Stored like the DecisionCache: bounded, most recent last, and dropped on
+    load once priorities.json or prompt.txt no longer match the fingerprint.
+    """
+
+    def __init__(self, fingerprint: str, path: str = DEFAULT_HISTORY_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._load()
+
+    def _load(self) -> None:
+        self._entries.update(load_entries(self.path, self.fingerprint))
+
+    def add(self, note_text: str, decision: str) -> None:
+        self._entries[note_text] = decision
+        self._entries.move_to_end(note_text)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def items(self) -> List[Tuple[str, str]]:
+        return list(self._entries.items())
+
+    def save(self) -> None:
+        save_entries(self.path, self.fingerprint, list(self._entries.items()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SparseRows:
+    """Coordinate-format matrix: notes only use a handful of the vocabulary's terms."""
+
+    def __init__(self, count: int, columns: int, rows: np.ndarray, column_indices: np.ndarray, values: np.ndarray):
+        self.count = count
+        self.columns = columns
+        self.rows = rows
+        self.column_indices = column_indices
+        self.values = values
+
+    def dot(self, dense: np.ndarray) -> np.ndarray:
+        """self @ dense"""
+        return np.stack([
+            np.bincount(self.rows, weights=self.values * dense[self.column_indices, k], minlength=self.count)
+            for k in range(dense.shape[1])
+        ], axis=1)
+
+    def transpose_dot(self, dense: np.ndarray) -> np.ndarray:
+        """self.T @ dense"""
+        return np.stack([
+            np.bincount(self.column_indices, weights=self.values * dense[self.rows, k], minlength=self.columns)
+            for k in range(dense.shape[1])
+        ], axis=1)
+
+
+class LocalClassifier:
+    """TF-IDF features and multinomial logistic regression, in NumPy.
+
+    Trained at startup on the decision history; predict() returns each
+    note's most likely label with its probability, so callers only trust
+    it above a confidence threshold.
+    """
+
+    def __init__(self, max_features: int = MAX_FEATURES, l2: float = 1e-4, iterations: int = 150, learning_rate: float = 5.0, momentum: float = 0.9):
+        self.max_features = max_features
+        self.l2 = l2
+        self.iterations = iterations
+        self.learning_rate = learning_rate
+        self.momentum = momentum
+        self.labels: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None
+        self.bias: Optional[np.ndarray] = None
+
+    @property
+    def trained(self) -> bool:
+        return self.weights is not None
+
+    def _features(self, texts: List[str]) -> SparseRows:
+        """L2-normalised TF-IDF rows with sublinear term frequencies."""
+        rows, columns, values = [], [], []
+        for row, text in enumerate(texts):
+            for token, count in Counter(tokenize(text)).items():
+                column = self.vocabulary.get(token)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    values.append((1 + math.log(count)) * self.idf[column])
+        features = SparseRows(len(texts), len(self.vocabulary), np.array(rows, dtype=np.int64),
+                              np.array(columns, dtype=np.int64), np.array(values, dtype=np.float64))
+        norms = np.sqrt(np.bincount(features.rows, weights=features.values ** 2, minlength=len(texts)))
+        features.values /= np.maximum(norms[features.rows], 1e-12)
+        return features
+
+    def fit(self, examples: List[Tuple[str, str]]) -> bool:
+        """Train on (note text, decision) pairs; returns False if there are too few."""
+        self.weights = None
+        labels = sorted({decision for _, decision in examples})
+        if len(examples) < MIN_TRAINING_NOTES or len(labels) < 2:
+            return False
+        texts = [text for text, _ in examples]
+
+        # Terms seen in at least two notes, most widespread first
+        document_frequency = Counter(token for text in texts for token in set(tokenize(text)))
+        terms = [token for token, count in document_frequency.most_common(self.max_features) if count >= 2]
+        if not terms:
+            return False
+        self.vocabulary = {token: column for column, token in enumerate(terms)}
+        frequencies = np.array([document_frequency[token] for token in terms], dtype=np.float64)
+        self.idf = np.log((1 + len(texts)) / (1 + frequencies)) + 1
+        self.labels = labels
+
+        features = self._features(texts)
+        label_index = {label: index for index, label in enumerate(labels)}
+        targets = np.zeros((len(texts), len(labels)))
+        targets[np.arange(len(texts)), [label_index[decision] for _, decision in examples]] = 1
+        weights = np.zeros((features.columns, len(labels)))
+        bias = np.zeros(len(labels))
+        weight_step = np.zeros_like(weights)
+        bias_step = np.zeros_like(bias)
+        # Full-batch gradient descent with momentum on the L2-regularised cross-entropy
+        for _ in range(self.iterations):
+            error = (self._softmax(features.dot(weights) + bias) - targets) / len(texts)
+            weight_step = self.momentum * weight_step - self.learning_rate * (features.transpose_dot(error) + self.l2 * weights)
+            bias_step = self.momentum * bias_step - self.learning_rate * error.sum(axis=0)
+            weights += weight_step
+            bias += bias_step
+        self.weights, self.bias = weights, bias
+        return True
+
+    @staticmethod
+    def _softmax(scores: np.ndarray) -> np.ndarray:
+        exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Most likely decision and its probability for each note."""
+        if not self.trained or not texts:
+            return [('UNCERTAIN', 0.0)] * len(texts)
+        probabilities = self._softmax(self._features(texts).dot(self.weights) + self.bias)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[index], float(probabilities[row, index])) for row, index in enumerate(best)]
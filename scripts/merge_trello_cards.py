@@ -1,209 +1,263 @@
-import os
-import requests
+import argparse
+import concurrent.futures
+import io
 import sys
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from dotenv import load_dotenv
 from tqdm import tqdm
+from journal import Journal
 from trello import (
-    get_trello_card,
+    BoardCache,
+    BoardSnapshot,
+    NameResolver,
+    TrelloClient,
+    WriteQueue,
+    add_profile_arguments,
+    cluster_cards,
+    enable_profiling_from_args,
+    get_board_snapshot,
+    get_default_client,
+    item_pos,
+    set_default_client,
     update_card_description,
     delete_trello_card,
-    get_trello_boards,
     get_trello_board_lists,
-    get_trello_board_cards,
     delete_trello_list
 )
+from trello.batch import DEFAULT_MAX_WORKERS
 
 load_dotenv()
 
-def create_trello_list(board_id: str, name: str) -> Dict:
-    """Create a new list in the specified board."""
-    # First get existing lists to calculate position
-    lists = get_trello_board_lists(board_id)
+JOURNAL_PATH = '.merge_trello_cards.journal.jsonl'
+MAX_DESC_LENGTH = 8000  # Trello's limit with some buffer
+
+def new_list_pos(lists: List[Dict]) -> float:
+    """Position that places a new list third on a board with `lists`."""
     if len(lists) >= 2:
         # Get position of second list
-        third_position = (lists[1]['pos'] + lists[2]['pos']) / 2 if len(lists) > 2 else lists[1]['pos'] + 16384
-    else:
-        third_position = 32768  # Default Trello position increment
+        return (lists[1]['pos'] + lists[2]['pos']) / 2 if len(lists) > 2 else lists[1]['pos'] + 16384
+    return 32768  # Default Trello position increment
+
+def create_trello_list(board_id: str, name: str, lists: Optional[List[Dict]] = None) -> Dict:
+    """Create a new list in the specified board."""
+    # First get existing lists to calculate position, unless already known
+    if lists is None:
+        lists = get_trello_board_lists(board_id)
 
-    url = f'https://api.trello.com/1/lists'
     params = {
         'name': name,
         'idBoard': board_id,
-        'pos': third_position,
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
+        'pos': new_list_pos(lists)
     }
+    return get_default_client().post('/lists', params=params)
 
-    response = requests.post(url, params=params)
-    response.raise_for_status()
-    return response.json()
-
-def create_trello_card_with_attachment(list_id: str, name: str, description: str = "") -> Dict:
-    """Create a card and add large content as an attachment."""
-    from tempfile import NamedTemporaryFile
-    
-    # Create card with minimal description
-    card = create_trello_card(
-        list_id,
-        name,
-        "This card's full content is available in the attached markdown file due to length."
-    )
-    
-    # Create temporary file with full content
-    with NamedTemporaryFile(mode='w', suffix='.md', delete=False) as temp_file:
-        temp_file.write(description)
-        temp_path = temp_file.name
-    
-    try:
-        # Upload as attachment
-        url = f'https://api.trello.com/1/cards/{card["id"]}/attachments'
-        with open(temp_path, 'rb') as file_content:
-            files = {
-                'file': (
-                    f'{name}_full_content.md',
-                    file_content,
-                    'text/markdown'
-                )
-            }
-            params = {
-                'key': os.getenv("TRELLO_KEY"),
-                'token': os.getenv("TRELLO_TOKEN")
-            }
-            response = requests.post(url, params=params, files=files)
-            response.raise_for_status()
-    finally:
-        os.unlink(temp_path)
+def create_trello_card_with_attachment(list_id: str, name: str, description: str = "", pos: Optional[float] = None) -> Dict:
+    """Create a card with large content attached as a markdown file."""
+    params = {
+        'name': name,
+        'idList': list_id,
+        'desc': "This card's full content is available in the attached markdown file due to length."
+    }
+    if pos is not None:
+        params['pos'] = pos
     
-    return card
+    # The content is uploaded straight from memory as the card's fileSource,
+    # so the card and its attachment are created in a single request
+    files = {
+        'fileSource': (
+            f'{name}_full_content.md',
+            io.BytesIO(description.encode('utf-8')),
+            'text/markdown'
+        )
+    }
+    return get_default_client().post('/cards', params=params, files=files)
 
-def create_trello_card(list_id: str, name: str, description: str = "") -> Dict:
+def create_trello_card(list_id: str, name: str, description: str = "", pos: Optional[float] = None) -> Dict:
     """Create a new card in the specified list."""
-    MAX_DESC_LENGTH = 8000  # Trello's limit with some buffer
-
     # If description is too long, create card with attachment instead
     if len(description) > MAX_DESC_LENGTH:
         print(f"Description exceeds {MAX_DESC_LENGTH} characters. Creating card with attachment...")
-        return create_trello_card_with_attachment(list_id, name, description)
+        return create_trello_card_with_attachment(list_id, name, description, pos)
     
-    url = f'https://api.trello.com/1/cards'
     params = {
         'name': name,
         'idList': list_id,
-        'desc': description,
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
+        'desc': description
     }
-    response = requests.post(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    if pos is not None:
+        params['pos'] = pos
+    return get_default_client().post('/cards', params=params)
 
-def create_checklist(card_id: str, name: str) -> Dict:
+def create_checklist(card_id: str, name: str, pos: Optional[float] = None) -> Dict:
     """Create a new checklist on a card."""
-    url = f'https://api.trello.com/1/checklists'
     params = {
         'name': name,
-        'idCard': card_id,
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
+        'idCard': card_id
     }
-    response = requests.post(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    if pos is not None:
+        params['pos'] = pos
+    return get_default_client().post('/checklists', params=params)
 
-def add_checklist_item(checklist_id: str, name: str) -> Dict:
+def add_checklist_item(checklist_id: str, name: str, pos: Optional[float] = None) -> Dict:
     """Add an item to a checklist."""
-    url = f'https://api.trello.com/1/checklists/{checklist_id}/checkItems'
-    params = {
-        'name': name,
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.post(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    params = {'name': name}
+    if pos is not None:
+        params['pos'] = pos
+    return get_default_client().post(f'/checklists/{checklist_id}/checkItems', params=params)
+
+def add_checklist_items(queue: WriteQueue, checklist_id: str, names: List[str]) -> None:
+    """Queue items for a checklist, pinning their order with explicit positions."""
+    for index, name in enumerate(names):
+        params = {'name': name, 'pos': item_pos(index)}
+        queue.submit('POST', f'/checklists/{checklist_id}/checkItems', params=params)
 
 def get_card_checklists(card_id: str) -> List[Dict]:
     """Get all checklists from a card."""
-    url = f'https://api.trello.com/1/cards/{card_id}/checklists'
-    params = {
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    return get_default_client().get(f'/cards/{card_id}/checklists')
+
+def delete_checklist(checklist_id: str) -> None:
+    """Delete a checklist and its items."""
+    get_default_client().delete(f'/checklists/{checklist_id}')
 
-def merge_list_cards_into_single_card_in_new_list(board_id: str, source_list_id: str):
-    """Merge all cards from a list into a single new card in a new list."""
+def get_or_create_merged_list(board_id: str, snapshot: BoardSnapshot) -> Dict:
+    """Return the "merged cards" list, creating it if it doesn't exist."""
+    merged_list = snapshot.find_list("merged cards")
+    if not merged_list:
+        merged_list = create_trello_list(board_id, "merged cards", lists=snapshot.lists)
+        snapshot.add_list(merged_list)
+    return merged_list
+
+def merge_list_cards_into_single_card_in_new_list(board_id: str, source_list_id: str, snapshot: Optional[BoardSnapshot] = None, journal: Optional[Journal] = None, pos: Optional[float] = None, dedupe_threshold: Optional[float] = None):
+    """Merge all cards from a list into a single new card in a new list.
+
+    All reads are served from `snapshot`, which is fetched if not supplied.
+    With a `journal`, steps finished by an earlier interrupted run are
+    skipped and a half-finished step is redone without duplicating cards.
+    With a `dedupe_threshold`, cards at least that similar share one
+    section of the description; otherwise every card gets its own.
+    """
+    if snapshot is None:
+        snapshot = get_board_snapshot(board_id)
+    
     # Get source list details
-    lists = get_trello_board_lists(board_id)
-    source_list = next((lst for lst in lists if lst['id'] == source_list_id), None)
+    source_list = snapshot.lists_by_id.get(source_list_id)
     
     if not source_list:
         raise ValueError(f"Could not find list with ID {source_list_id}")
 
-    # Check if "merged cards" list already exists
-    lists = get_trello_board_lists(board_id)
-    merged_list = next((lst for lst in lists if lst['name'] == "merged cards"), None)
-    
-    # Create "merged cards" list if it doesn't exist
-    if not merged_list:
-        merged_list = create_trello_list(board_id, "merged cards")
+    merged_list = get_or_create_merged_list(board_id, snapshot)
     
     # Get all cards from source list
-    cards = get_trello_board_cards(board_id)
-    source_cards = [card for card in cards if card['idList'] == source_list_id]
+    source_cards = snapshot.list_cards(source_list_id)
     
     if not source_cards:
         print("No cards found in source list")
         return
     
-    # Create new merged card
-    merged_description = ""
-    for card in source_cards:
-        card_details = get_trello_card(card['id'])
-        merged_description += f"### {card['name']}\n\n"
+    if dedupe_threshold is not None:
+        groups = cluster_cards(source_cards, dedupe_threshold)
+    else:
+        groups = [[card] for card in source_cards]
+    
+    # Create new merged card; the parts are joined once at the end since
+    # repeated concatenation is quadratic on large lists
+    parts = []
+    for group in groups:
+        parts.append(f"### {group[0]['name']}\n\n")
+        if len(group) > 1:
+            parts.append(f"*Also captured as: {'; '.join(card['name'] for card in group[1:])}*\n\n")
         
-        # Add description if it exists
-        if card_details['desc']:
-            merged_description += f"{card_details['desc']}\n\n"
+        # Add descriptions if they exist; a near-duplicate's is only left out
+        # when another card of the group already contains it
+        descs = [(card['desc'] or '').strip() for card in group]
+        for position, desc in enumerate(descs):
+            if desc and not any(
+                desc in other and (len(other) > len(desc) or earlier < position)
+                for earlier, other in enumerate(descs) if earlier != position
+            ):
+                parts.append(f"{desc}\n\n")
         
         # Add any attachments/links
-        if card_details['attachments']:
-            merged_description += "**Attachments:**\n"
-            for attachment in card_details['attachments']:
+        attachments = {}
+        for card in group:
+            for attachment in card.get('attachments') or []:
                 if attachment['url']:
-                    merged_description += f"- [{attachment['name'] or attachment['url']}]({attachment['url']})\n"
-            merged_description += "\n"
+                    attachments.setdefault(attachment['url'], attachment)
+        if attachments:
+            parts.append("**Attachments:**\n")
+            for url, attachment in attachments.items():
+                parts.append(f"- [{attachment['name'] or url}]({url})\n")
+            parts.append("\n")
         
-        merged_description += "---\n\n"
+        parts.append("---\n\n")
+    merged_description = "".join(parts)
+    
+    card_key = f"merge:{source_list_id}:card"
+    checklists_key = f"merge:{source_list_id}:checklists"
+    
+    if journal and journal.is_done(card_key):
+        new_card = journal.result(card_key)
+    else:
+        new_card = None
+        if journal and journal.is_pending(card_key):
+            # The card may have been created just before the previous run
+            # died. Topic lists recur every week, so "merged cards" can hold
+            # older cards of the same name; only the position planned for
+            # this one identifies it
+            pos = journal.details(card_key).get('pos', pos)
+            if pos is not None:
+                new_card = next((
+                    c for c in snapshot.list_cards(merged_list['id'])
+                    if c['name'] == source_list['name'] and c['pos'] == pos
+                ), None)
+        if new_card is None:
+            if journal:
+                journal.plan(card_key, list_name=source_list['name'], pos=pos)
+            new_card = create_trello_card(
+                merged_list['id'],
+                source_list['name'],
+                merged_description,
+                pos
+            )
+        if journal:
+            journal.complete(card_key, {'id': new_card['id']})
+    
+    if journal and journal.is_done(checklists_key):
+        return
+    if journal and journal.is_pending(checklists_key):
+        # Start the checklists over rather than guess which items made it
+        for checklist in get_card_checklists(new_card['id']):
+            delete_checklist(checklist['id'])
+    if journal:
+        journal.plan(checklists_key)
     
-    new_card = create_trello_card(
-        merged_list['id'],
-        source_list['name'],
-        merged_description
-    )
+    # Default checklist with card names, then one checklist named after each
+    # original card + checklist with all of its items; a near-duplicate's
+    # checklist is left out if an earlier card of its group had the same one
+    checklists = [("Original Cards", [card['name'] for card in source_cards])]
+    for group in groups:
+        seen = set()
+        for card in group:
+            for checklist in snapshot.card_checklists(card['id']):
+                items = [item['name'] for item in checklist['checkItems']]
+                if (checklist['name'], tuple(items)) in seen:
+                    continue
+                seen.add((checklist['name'], tuple(items)))
+                checklists.append((f"{card['name']} - {checklist['name']}", items))
     
-    # Create default checklist with card names
-    default_checklist = create_checklist(new_card['id'], "Original Cards")
-    for card in source_cards:
-        add_checklist_item(default_checklist['id'], card['name'])
+    # Checklists and items are all created in parallel; explicit positions
+    # keep both in the same order as the original cards
+    with WriteQueue() as queue:
+        created = [
+            queue.submit('POST', '/checklists', params={'name': name, 'idCard': new_card['id'], 'pos': item_pos(index)})
+            for index, (name, _) in enumerate(checklists)
+        ]
+        for future, (_, items) in zip(created, checklists):
+            add_checklist_items(queue, future.result()['id'], items)
     
-    # Handle cards with checklists
-    for card in source_cards:
-        checklists = get_card_checklists(card['id'])
-        if checklists:
-            for checklist in checklists:
-                # Create new checklist named after original card + checklist
-                new_checklist = create_checklist(
-                    new_card['id'],
-                    f"{card['name']} - {checklist['name']}"
-                )
-                # Add all items from original checklist
-                for item in checklist['checkItems']:
-                    add_checklist_item(new_checklist['id'], item['name'])
+    if journal:
+        journal.complete(checklists_key)
 
 lists_not_to_merge = ["inbox", "culled for upcoming week", "deferred", "...", "merged cards"]
 
@@ -220,19 +274,33 @@ def should_merge_list(list_name: str) -> bool:
     return True
 
 def main():
-    # Get inbox board
-    boards = get_trello_boards()
-    inbox_board = next((board for board in boards if board['name'].lower() == 'inbox'), None)
+    parser = argparse.ArgumentParser(description='Merge the cards of each topic list on the inbox board into a single card')
+    parser.add_argument('--no-cache', action='store_true', help='Look up boards from the API instead of the local cache')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run without recreating merged cards')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of lists to merge concurrently')
+    parser.add_argument('--dedupe-threshold', type=float, default=None, help='Collapse cards at least this similar (e.g. 0.8) into one section of the merged card; off by default')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    enable_profiling_from_args(args)
+    jobs = max(1, args.jobs)
     
-    if not inbox_board:
-        print("Could not find inbox board")
+    # Each job runs its own write queue, so size the connection pool for all of them
+    if jobs > 1:
+        set_default_client(TrelloClient(pool_size=jobs * DEFAULT_MAX_WORKERS))
+
+    # Get inbox board
+    resolver = NameResolver(get_default_client() if args.no_cache else BoardCache())
+    try:
+        inbox_board_id = resolver.resolve_board('inbox')
+    except LookupError as e:
+        print(f"Could not find inbox board: {e}")
         sys.exit(1)
     
-    # Get all lists from inbox board
-    lists = get_trello_board_lists(inbox_board['id'])
+    # Fetch lists, cards and checklists of the whole board in one request
+    snapshot = get_board_snapshot(inbox_board_id)
     
     # Filter lists that should be merged
-    lists_to_merge = [lst for lst in lists if should_merge_list(lst['name'])]
+    lists_to_merge = [lst for lst in snapshot.lists if should_merge_list(lst['name'])]
     
     if not lists_to_merge:
         print("No lists found to merge")
@@ -242,15 +310,49 @@ def main():
     for lst in lists_to_merge:
         print(f"  - {lst['name']}")
     
-    # Merge each qualifying list
-    for lst in lists_to_merge:
+    # Created up front so that concurrent merges don't each create one
+    merged_list = get_or_create_merged_list(inbox_board_id, snapshot)
+    # Merged cards go below any existing ones, in the order of their lists
+    first_pos = max((card['pos'] for card in snapshot.list_cards(merged_list['id'])), default=0)
+    
+    # Every mutation is journaled so an interrupted run can be resumed
+    journal = Journal(JOURNAL_PATH, resume=args.resume)
+    
+    def merge_and_archive(index: int, lst: Dict) -> None:
         print(f"\nMerging cards from list '{lst['name']}'...")
-        merge_list_cards_into_single_card_in_new_list(inbox_board['id'], lst['id'])
+        merge_list_cards_into_single_card_in_new_list(inbox_board_id, lst['id'], snapshot, journal, first_pos + item_pos(index), args.dedupe_threshold)
         
         # Delete source list after successful merge
         print(f"Archiving list '{lst['name']}'...")
+        journal.plan(f"merge:{lst['id']}:archive")
         delete_trello_list(lst['id'])
+        journal.complete(f"merge:{lst['id']}:archive")
+    
+    failed = []
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+    try:
+        futures = {executor.submit(merge_and_archive, index, lst): lst for index, lst in enumerate(lists_to_merge)}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Failed to merge list '{futures[future]['name']}': {e}")
+                failed.append(futures[future])
+        executor.shutdown()
+    except BaseException:
+        # Lists not started yet are dropped rather than merged on the way out;
+        # merges already running finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+        journal.close()
+        print("\nMerge interrupted; rerun with --resume to continue where it stopped")
+        raise
+    
+    if failed:
+        journal.close()
+        print(f"\n{len(failed)} list(s) failed to merge; rerun with --resume to retry them")
+        sys.exit(1)
     
+    journal.finish()
     print("\nDone!")
 
 if __name__ == "__main__":
@@ -1,110 +1,220 @@
+import argparse
+import concurrent.futures
+from typing import Callable, Dict, List
 import readchar
 from tqdm import tqdm
 import requests
 from dotenv import load_dotenv
 from trello import (
-    get_trello_boards,
-    get_trello_board_cards,
+    BackgroundWriter,
+    BoardCache,
+    NameResolver,
+    Prefetcher,
+    WriteQueue,
+    add_profile_arguments,
+    cluster_cards,
+    enable_profiling_from_args,
+    get_default_client,
+    get_trello_card,
     move_trello_card_to_list,
-    delete_trello_card,
-    get_trello_board_lists
+    delete_trello_card
 )
 
 load_dotenv()
 INBOX_BOARD_NAME = 'inbox'
+# Only the fields shown while triaging are downloaded
+CARD_FIELDS = 'name,desc,idList'
+# Full details of this many upcoming cards are fetched in the background
+PREFETCH_AHEAD = 5
+
+def move_cards(cards: List[Dict], list_id: str, desc: str) -> None:
+    """Move many cards to a list with parallel writes, reporting failures."""
+    with WriteQueue() as queue:
+        futures = [queue.submit('PUT', f"/cards/{card['id']}", params={'idList': list_id}) for card in cards]
+        for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc=desc):
+            try:
+                future.result()
+            except requests.exceptions.HTTPError:
+                print("ERROR when moving card!")
+        queue.flush(return_exceptions=True)
+
+def for_each_card(action: Callable, cards: List[Dict], **kwargs) -> None:
+    """Apply a single-card action to every card of a near-duplicate group."""
+    for card in cards:
+        action(card_id=card['id'], **kwargs)
+
+def describe_group(group: List[Dict]) -> str:
+    duplicates = len(group) - 1
+    return f"'{group[0]['name']}'" + (f" and {duplicates} near-duplicate(s)" if duplicates else "")
 
 def main():
+    parser = argparse.ArgumentParser(description='Interactively triage the cards in the Trello inbox list')
+    parser.add_argument('--no-cache', action='store_true', help='Read boards, lists and cards from the API instead of the local cache')
+    parser.add_argument('--dedupe-threshold', type=float, default=None, help='Review cards at least this similar (e.g. 0.8) as one group; off by default')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    enable_profiling_from_args(args)
+
+    # The local cache only downloads what changed since the last run
+    trello = get_default_client() if args.no_cache else BoardCache()
+
+    resolver = NameResolver(trello)
+
     print("Getting Trello boards ...")
-    boards = get_trello_boards()
-    inbox_board_id = [board['id'] for board in boards if board['name'] == INBOX_BOARD_NAME][0]
+    inbox_board_id = resolver.resolve_board(INBOX_BOARD_NAME)
     print(f"Inbox Board Id: {inbox_board_id}")
 
     print("Getting lists ...")
-    lists = get_trello_board_lists(board_id=inbox_board_id)
-    inbox_list_id = [ls['id'] for ls in lists if ls['name'] == 'inbox'][0]
-    culled_list_id = [ls['id'] for ls in lists if ls['name'] == 'culled for upcoming week'][0]
-    defer_list_id = [ls['id'] for ls in lists if ls['name'] == 'deferred'][0]
+    inbox_list_id = resolver.resolve_list(inbox_board_id, 'inbox')
+    culled_list_id = resolver.resolve_list(inbox_board_id, 'culled for upcoming week')
+    defer_list_id = resolver.resolve_list(inbox_board_id, 'deferred')
     print(f"Inbox and culled list ids: {[inbox_list_id, culled_list_id]}")
 
     print("Looping through cards for culling ...")
-    board_cards = get_trello_board_cards(board_id=inbox_board_id)
-    inbox_cards = [card for card in board_cards if card['idList'] == inbox_list_id]
+    inbox_cards = trello.get_list_cards(inbox_list_id, fields=CARD_FIELDS)
+    # Near-duplicate captures are shown once; culling, keeping and deferring
+    # apply to the whole group, deleting only to the card shown
+    if args.dedupe_threshold is not None:
+        groups = cluster_cards(inbox_cards, args.dedupe_threshold)
+    else:
+        groups = [[card] for card in inbox_cards]
     
     # Track cards that were reviewed but not culled/deleted
     cards_to_defer = []
     
+    # Culls and deletes are sent in the background so the next card shows
+    # immediately; each one can be undone with BACKSPACE until it is sent
+    writer = BackgroundWriter()
+    # Details of the next few cards are fetched ahead so the detail view opens instantly
+    details = Prefetcher(get_trello_card)
+    # Decisions in review order as (group index, write), write is None for kept groups
+    history = []
+    status = ""
+    
     i = 0
-    total_cards = len(inbox_cards)
-    while i < total_cards:
-        print("\033c", end="")  # ANSI escape code to clear terminal screen
-        print(f"Progress: {i + 1}/{total_cards} cards")
-        print("-"*3)
-        print(f"\n\n{inbox_cards[i]['name']}\n\n")
-        print("-"*3)
-
-        print("\n\n\nPress SPACE to cull, D to delete, U to defer all reviewed cards,")
-        print("BACKSPACE to go back, or any other key to keep ...")
-        print("\nYou can press CTRL-C at any time to quit the session, it is recommended to press 'U' first to save your state.")
-
-        try:
-            key = readchar.readkey()
-
-        except KeyboardInterrupt:
-            print("\n\nGracefully exiting...")
-            # Auto-defer any remaining reviewed cards
-            if cards_to_defer:
-                print(f"\nAuto-deferring {len(cards_to_defer)} reviewed cards...")
-                for card in tqdm(cards_to_defer, desc="Auto-deferring cards"):
-                    move_trello_card_to_list(card_id=card['id'], list_id=defer_list_id)
-                print("\nDone!")
-
-            return True
-        
-        if key.lower() == "u":
-            if cards_to_defer:
-                print(f"\nDeferring {len(cards_to_defer)} cards...")
-                # Move all reviewed but not culled/deleted cards to defer list
-                for card in tqdm(cards_to_defer, desc="Deferring cards"):
-                    move_trello_card_to_list(card_id=card['id'], list_id=defer_list_id)
-                input("\nDone! Press Enter to continue...")
-
-            cards_to_defer = []  # Clear the list after deferring
-            continue
-
-        if key == "\x7f":  # Backspace key
-            i = max(0, i - 1)  # Go back one card, but not before the first card
-            continue
-            
-        if key == " ":
-            move_trello_card_to_list(card_id=inbox_cards[i]['id'], list_id=culled_list_id)
-            input("\nMoved card to culled list!")
-
-        elif key.lower() == "d":
-            delete_trello_card(card_id=inbox_cards[i]['id'])
-            input("\nDeleted card!")
+    total_groups = len(groups)
+    try:
+        while i < total_groups:
+            group = groups[i]
+            details.prefetch(upcoming[0]['id'] for upcoming in groups[i:i + PREFETCH_AHEAD])
+            print("\033c", end="")  # ANSI escape code to clear terminal screen
+            print(f"Progress: {i + 1}/{total_groups} cards" + (f" ({len(inbox_cards)} including near-duplicates)" if total_groups != len(inbox_cards) else ""))
+            print("-"*3)
+            print(f"\n\n{group[0]['name']}\n\n")
+            if len(group) > 1:
+                print("Also captured as (culling and keeping apply to these too, deleting does not):")
+                for duplicate in group[1:]:
+                    print(f"  - {duplicate['name']}")
+            print("-"*3)
+
+            print("\n\n\nPress SPACE to cull, D to delete, U to defer all reviewed cards,")
+            print("I for card details, BACKSPACE to go back, or any other key to keep ...")
+            print("\nYou can press CTRL-C at any time to quit the session, it is recommended to press 'U' first to save your state.")
+            print_status(status, history, writer)
+            status = ""
 
-        else:
-            # Card was reviewed but not culled/deleted, add to defer candidates
-            cards_to_defer.append(inbox_cards[i])
+            key = readchar.readkey()
             
-        i += 1
+            if key.lower() == "u":
+                # Move all reviewed but not culled/deleted cards to defer list
+                for card in cards_to_defer:
+                    writer.submit(move_trello_card_to_list, card_id=card['id'], list_id=defer_list_id,
+                                  description=f"Defer '{card['name']}'", undoable=False, keys=[card['id']])
+                status = f"Deferring {len(cards_to_defer)} cards in the background"
+                cards_to_defer = []  # Clear the list after deferring
+                continue
+
+            if key.lower() == "i":
+                print("\033c", end="")
+                try:
+                    print_card_details(details.get(group[0]['id']))
+                except requests.exceptions.RequestException as e:
+                    print(f"Could not load card details: {e}")
+                print("\n\nPress any key to go back to the card ...")
+                readchar.readkey()
+                continue
+
+            if key == "\x7f":  # Backspace key
+                i = max(0, i - 1)  # Go back one card, but not before the first card
+                if history and history[-1][0] == i:
+                    _, write = history.pop()
+                    if write is None:
+                        cards_to_defer = [card for card in cards_to_defer if card not in groups[i]]
+                    elif writer.cancel(write):
+                        status = f"Undone: {write.description}"
+                    else:
+                        status = f"Too late to undo: {write.description} ({write.status})"
+                continue
+                
+            if key == " ":
+                write = writer.submit(for_each_card, move_trello_card_to_list, group, list_id=culled_list_id,
+                                      description=f"Cull {describe_group(group)}", keys=[card['id'] for card in group])
+                history.append((i, write))
+
+            elif key.lower() == "d":
+                # Deletes can't be undone once sent, so near-duplicates the user
+                # only saw by title stay in the inbox
+                write = writer.submit(delete_trello_card, card_id=group[0]['id'],
+                                      description=f"Delete '{group[0]['name']}'", keys=[group[0]['id']])
+                history.append((i, write))
+
+            else:
+                # Cards were reviewed but not culled/deleted, add to defer candidates
+                cards_to_defer.extend(group)
+                history.append((i, None))
+                
+            i += 1
+    except KeyboardInterrupt:
+        print("\n\nGracefully exiting...")
+    finally:
+        details.close()
+        print("\nSending queued changes...")
+        writer.close()
+        for write in writer.failed():
+            print(f"Failed to {write.description}: {write.error}")
 
     # Handle any remaining cards that need to be deferred
     if cards_to_defer:
         print(f"\nDeferring {len(cards_to_defer)} remaining cards...")
-        for card in tqdm(cards_to_defer, desc="Deferring final cards"):
-            try: 
-                move_trello_card_to_list(card_id=card['id'], list_id=defer_list_id)
-            except requests.exceptions.HTTPError:
-                print("ERROR when moving card!")
-                pass
+        move_cards(cards_to_defer, defer_list_id, desc="Deferring final cards")
         print("\nDone!")
 
     return True
 
+def print_card_details(card: Dict) -> None:
+    """Show a card's description, attachments, checklists and comments."""
+    print(card['name'])
+    print("-"*3)
+    if card.get('desc'):
+        print(f"\n{card['desc']}")
+    if card.get('attachments'):
+        print("\nAttachments:")
+        for attachment in card['attachments']:
+            print(f"  - {attachment['name'] or attachment['url']}: {attachment['url']}")
+    for checklist in card.get('checklists', []):
+        print(f"\n{checklist['name']}:")
+        for item in sorted(checklist['checkItems'], key=lambda item: item['pos']):
+            print(f"  [{'x' if item['state'] == 'complete' else ' '}] {item['name']}")
+    comments = [action for action in card.get('actions', []) if action['type'] == 'commentCard']
+    if comments:
+        print("\nComments:")
+        for comment in comments:
+            author = comment.get('memberCreator', {}).get('fullName', 'unknown')
+            print(f"  {author} ({comment['date'][:10]}): {comment['data']['text']}")
+
+def print_status(status: str, history: List, writer: BackgroundWriter) -> None:
+    """Show the outcome of the last action without waiting for it."""
+    last_write = next((write for _, write in reversed(history) if write is not None), None)
+    if status:
+        print(f"\n{status}")
+    elif last_write:
+        print(f"\nLast action: {last_write.description} ({last_write.status})")
+    failed = writer.failed()
+    if failed:
+        print(f"{len(failed)} change(s) failed, latest: {failed[-1].description}: {failed[-1].error}")
+
 
 # TODO: text is narrower
-# TODO: ability to get more details on a card eg open the card
 
 
 if __name__ == "__main__":
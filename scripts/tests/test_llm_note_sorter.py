@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import unittest
+
+from llm_note_sorter import run_pipeline
+
+
+class FailingClassifier:
+    async def classify_batch(self, cards):
+        raise RuntimeError('classifier failed')
+
+
+class DecidingClassifier:
+    async def classify_batch(self, cards):
+        return [{'card': card, 'decision': 'ARCHIVE', 'moved': False} for card in cards]
+
+
+async def card_pages(count: int, page_size: int = 10):
+    for start in range(0, count, page_size):
+        yield [{'id': f'{number:024x}', 'name': f'Card {number}', 'desc': ''} for number in range(start, start + page_size)]
+
+
+def pipeline_args(**overrides) -> argparse.Namespace:
+    args = {'batch_size': 1, 'max_workers': 2, 'move_workers': 2, 'dedupe_threshold': None, 'dry_run': True}
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+class RunPipelineTest(unittest.TestCase):
+    def run_pipeline(self, classifier, args: argparse.Namespace, trello=None):
+        # More cards than the bounded queues hold, so a stuck stage would block
+        return asyncio.run(asyncio.wait_for(run_pipeline(card_pages(100), trello, classifier, {}, args), timeout=5))
+
+    def test_classifier_failure_is_raised(self):
+        with self.assertRaisesRegex(RuntimeError, 'classifier failed'):
+            self.run_pipeline(FailingClassifier(), pipeline_args())
+
+    def test_mover_failure_is_raised(self):
+        with self.assertRaises(KeyError):
+            # An empty list mapping makes every move fail
+            self.run_pipeline(DecidingClassifier(), pipeline_args(dry_run=False))
+
+    def test_every_card_passes_through(self):
+        results = self.run_pipeline(DecidingClassifier(), pipeline_args())
+        self.assertEqual(len(results), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,94 +1,60 @@
-import os
-import requests
-from typing import Dict, List
+from typing import Dict, List, Union
+
+from .aio import AsyncTrelloClient
+from .background import BackgroundWriter, PendingWrite
+from .batch import WriteQueue, batch_get, item_pos, plan_positions
+from .cache import BoardCache
+from .client import TrelloClient, get_default_client, set_default_client
+from .concurrency import AdaptiveConcurrency
+from .dedupe import DuplicateIndex, cluster_cards
+from .graph import Task, TaskGraph
+from .instrument import (
+    Profiler,
+    RequestEvent,
+    add_hook,
+    add_profile_arguments,
+    enable_profiling,
+    enable_profiling_from_args,
+    remove_hook
+)
+from .prefetch import Prefetcher
+from .ratelimit import RequestStats, RetryPolicy, TokenBucket
+from .resolver import AmbiguousNameError, NameResolver
+from .snapshot import BoardSnapshot, get_board_snapshot
 
 
 def get_trello_boards() -> List[Dict]:
     """Get all Trello boards for the authenticated user."""
-    url = 'https://api.trello.com/1/members/me/boards'
-    params = {
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    return get_default_client().get_boards()
 
 def get_trello_board_cards(board_id: str) -> List[Dict]:
     """Get all cards from a specific board."""
-    url = f'https://api.trello.com/1/boards/{board_id}/cards'
-    params = {
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    return get_default_client().get_board_cards(board_id)
+
+def get_trello_list_cards(list_id: str, fields: Union[str, List[str], None] = None) -> List[Dict]:
+    """Get the cards of a single list, optionally projected onto `fields`."""
+    return get_default_client().get_list_cards(list_id, fields)
 
 def move_trello_card_to_list(card_id: str, list_id: str) -> Dict:
     """Move a card to a different list."""
-    url = f'https://api.trello.com/1/cards/{card_id}'
-    params = {
-        'idList': list_id,
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.put(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    return get_default_client().move_card(card_id, list_id)
 
 def delete_trello_card(card_id: str) -> None:
     """Delete a Trello card."""
-    url = f'https://api.trello.com/1/cards/{card_id}'
-    params = {
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.delete(url, params=params)
-    response.raise_for_status()
+    get_default_client().delete_card(card_id)
 
 def get_trello_board_lists(board_id: str) -> List[Dict]:
     """Get all lists from a specific board."""
-    url = f'https://api.trello.com/1/boards/{board_id}/lists'
-    params = {
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    return get_default_client().get_board_lists(board_id)
 
 def get_trello_card(card_id: str) -> Dict:
     """Get full details of a Trello card including attachments and comments."""
-    url = f'https://api.trello.com/1/cards/{card_id}'
-    params = {
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN"),
-        'attachments': 'true',
-        'comments': 'true'
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    return response.json()
+    return get_default_client().get_card(card_id)
 
 def update_card_description(card_id: str, description: str) -> None:
     """Update a card's description."""
-    url = f'https://api.trello.com/1/cards/{card_id}'
-    params = {
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN"),
-        'desc': description
-    }
-    response = requests.put(url, params=params)
-    response.raise_for_status()
+    get_default_client().update_card_description(card_id, description)
 
 def delete_trello_list(list_id: str) -> None:
     """Delete a Trello list."""
-    url = f'https://api.trello.com/1/lists/{list_id}/closed'
-    params = {
-        'value': 'true',  # Archive/close the list
-        'key': os.getenv("TRELLO_KEY"),
-        'token': os.getenv("TRELLO_TOKEN")
-    }
-    response = requests.put(url, params=params)
-    response.raise_for_status()
+    get_default_client().close_list(list_id)
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import time
+import httpx
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+from .client import BASE_URL, CARD_DETAIL_PARAMS, DEFAULT_TIMEOUT, fields_param
+from .concurrency import AdaptiveConcurrency
+from .instrument import record_attempt
+from .ratelimit import RequestStats, RetryPolicy, TokenBucket, parse_retry_after, rewind_files
+
+DEFAULT_MAX_CONCURRENCY = 50
+DEFAULT_PAGE_SIZE = 100
+
+
+class AsyncTrelloClient:
+    """Asyncio Trello client sharing one connection pool and a concurrency limit.
+
+    All requests go through a semaphore so that any number of coroutines can
+    be scheduled at once while at most `max_concurrency` are in flight. Pacing
+    and retries follow the same rules as the synchronous TrelloClient. An
+    AdaptiveConcurrency passed as `concurrency` replaces the fixed semaphore,
+    with `max_concurrency` still sizing the connection pool, and only follows
+    this client's requests unless it was given a client already.
+    """
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        token: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        base_url: Optional[str] = None,
+        limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None
+    ):
+        self.base_url = (base_url or os.getenv('TRELLO_API_URL') or BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.limiter = limiter or TokenBucket()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.stats = RequestStats()
+        self.auth_params = {
+            'key': key or os.getenv("TRELLO_KEY"),
+            'token': token or os.getenv("TRELLO_TOKEN")
+        }
+        if concurrency is not None and concurrency.client is None:
+            concurrency.client = self
+        self._semaphore = concurrency or asyncio.Semaphore(max_concurrency)
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            )
+        )
+
+    async def request(self, method: str, path: str, params: Optional[Dict] = None, **kwargs) -> httpx.Response:
+        """Send a request to the Trello API, retrying and raising on HTTP errors."""
+        params = {**self.auth_params, **(params or {})}
+        url = f'{self.base_url}{path}'
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                self.stats.record(requests=1, wait_seconds=await self.limiter.acquire_async())
+                started = time.perf_counter()
+                try:
+                    response = await self._http.request(method, url, params=params, **kwargs)
+                except httpx.TransportError as e:
+                    record_attempt('trello', method, path, None, 0, started, attempt, e, client=self)
+                    if not self.retry_policy.should_retry(method, attempt):
+                        self.stats.record(failed=1)
+                        raise
+                    delay = self.retry_policy.delay(attempt)
+                else:
+                    status = response.status_code
+                    record_attempt('trello', method, path, status, len(response.content), started, attempt, client=self)
+                    if status == 429:
+                        self.stats.record(throttled=1)
+                    if status < 400 or not self.retry_policy.should_retry(method, attempt, status):
+                        if status >= 400:
+                            self.stats.record(failed=1)
+                        response.raise_for_status()
+                        return response
+                    delay = self.retry_policy.delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                    if status == 429:
+                        self.limiter.pause(delay)
+            # Sleep outside the semaphore so backing-off requests don't hold a slot
+            self.stats.record(retried=1)
+            rewind_files(kwargs.get('files'))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, path: str, params: Optional[Dict] = None) -> Any:
+        return (await self.request('GET', path, params=params)).json()
+
+    async def post(self, path: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        return (await self.request('POST', path, params=params, **kwargs)).json()
+
+    async def put(self, path: str, params: Optional[Dict] = None) -> Any:
+        return (await self.request('PUT', path, params=params)).json()
+
+    async def delete(self, path: str, params: Optional[Dict] = None) -> None:
+        await self.request('DELETE', path, params=params)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> 'AsyncTrelloClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def get_boards(self) -> List[Dict]:
+        """Get all Trello boards for the authenticated user."""
+        return await self.get('/members/me/boards')
+
+    async def get_board_cards(self, board_id: str, fields: Union[str, List[str], None] = None) -> List[Dict]:
+        """Get all cards from a specific board."""
+        return await self.get(f'/boards/{board_id}/cards', params=fields_param(fields))
+
+    async def get_list_cards(self, list_id: str, fields: Union[str, List[str], None] = None) -> List[Dict]:
+        """Get the open cards of a single list, optionally only some fields."""
+        return await self.get(f'/lists/{list_id}/cards', params=fields_param(fields))
+
+    async def iter_list_cards(self, list_id: str, page_size: int = DEFAULT_PAGE_SIZE, fields: Union[str, List[str], None] = None) -> AsyncIterator[List[Dict]]:
+        """Yield the open cards of a list one page at a time.
+
+        Pages are requested with `limit` and `before`, using the oldest card
+        id seen so far as the cursor; card ids start with their creation
+        timestamp, so they order by age.
+        """
+        before = None
+        seen = set()
+        while True:
+            params = {'limit': page_size, **fields_param(fields)}
+            if before:
+                params['before'] = before
+            page = [card for card in await self.get(f'/lists/{list_id}/cards', params=params) if card['id'] not in seen]
+            if not page:
+                return
+            seen.update(card['id'] for card in page)
+            yield page
+            if len(page) < page_size:
+                return
+            before = min(card['id'] for card in page)
+
+    async def get_board_lists(self, board_id: str) -> List[Dict]:
+        """Get all lists from a specific board."""
+        return await self.get(f'/boards/{board_id}/lists')
+
+    async def get_card(self, card_id: str) -> Dict:
+        """Get full details of a card including attachments, comments and checklists."""
+        return await self.get(f'/cards/{card_id}', params=CARD_DETAIL_PARAMS)
+
+    async def move_card(self, card_id: str, list_id: str) -> Dict:
+        """Move a card to a different list."""
+        return await self.put(f'/cards/{card_id}', params={'idList': list_id})
+
+    async def update_card_description(self, card_id: str, description: str) -> None:
+        """Update a card's description."""
+        await self.put(f'/cards/{card_id}', params={'desc': description})
+
+    async def delete_card(self, card_id: str) -> None:
+        """Delete a card."""
+        await self.delete(f'/cards/{card_id}')
+
+    async def close_list(self, list_id: str) -> None:
+        """Archive/close a list."""
+        await self.put(f'/lists/{list_id}/closed', params={'value': 'true'})
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, FrozenSet, Iterable, List, Optional
+
+# Seconds a write waits in the queue, during which it can still be undone
+DEFAULT_UNDO_WINDOW = 5.0
+
+
+class PendingWrite:
+    """A write handed to a BackgroundWriter and what became of it.
+
+    `status` is one of queued, cancelled, sending, done or failed.
+    """
+
+    def __init__(self, func: Callable[..., Any], args: tuple, kwargs: dict, description: str, due: float,
+                 keys: FrozenSet[str] = frozenset()):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.description = description
+        self.due = due
+        self.keys = keys
+        self.status = 'queued'
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class BackgroundWriter:
+    """Run writes on a worker thread so the caller never waits.
+
+    Each undoable write is held for `undo_window` seconds before it is sent
+    and can be cancelled until then. A write is sent once it is due and no
+    write queued before it shares one of its `keys` (e.g. card ids), so a
+    write that isn't undoable can overtake held writes for other cards;
+    writes without keys keep strict submit order. close() sends everything
+    still queued at once. Retries happen inside the client, so a failed
+    write is final.
+    """
+
+    def __init__(self, undo_window: float = DEFAULT_UNDO_WINDOW):
+        self.undo_window = undo_window
+        self.writes: List[PendingWrite] = []
+        self._queue: Deque[PendingWrite] = deque()
+        self._condition = threading.Condition()
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name='background-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable[..., Any], *args, description: str = '', undoable: bool = True,
+               keys: Iterable[str] = (), **kwargs) -> PendingWrite:
+        """Queue func(*args, **kwargs); writes that aren't `undoable` are due right away."""
+        due = time.monotonic() + (self.undo_window if undoable else 0)
+        write = PendingWrite(func, args, kwargs, description, due, frozenset(keys))
+        with self._condition:
+            if self._closing:
+                raise RuntimeError('BackgroundWriter is closed')
+            self.writes.append(write)
+            self._queue.append(write)
+            self._condition.notify()
+        return write
+
+    def cancel(self, write: PendingWrite) -> bool:
+        """Drop a write that hasn't been sent yet; False if it is too late."""
+        with self._condition:
+            if write.status != 'queued':
+                return False
+            write.status = 'cancelled'
+            self._queue.remove(write)
+            self._condition.notify()
+            return True
+
+    def failed(self) -> List[PendingWrite]:
+        return [write for write in self.writes if write.status == 'failed']
+
+    def close(self) -> None:
+        """Send every queued write without waiting out the undo window."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _next(self) -> Optional[PendingWrite]:
+        with self._condition:
+            while True:
+                if not self._queue:
+                    if self._closing:
+                        return None
+                    self._condition.wait()
+                    continue
+                write = self._first_ready()
+                if write is not None:
+                    self._queue.remove(write)
+                    write.status = 'sending'
+                    return write
+                # Nothing sendable: wait for the next write to come due
+                now = time.monotonic()
+                self._condition.wait(min(write.due for write in self._queue if write.due > now) - now)
+
+    def _first_ready(self) -> Optional[PendingWrite]:
+        """The earliest queued write that is due and not behind a write with a shared key."""
+        now = time.monotonic()
+        blocked = set()
+        for position, write in enumerate(self._queue):
+            if (write.due <= now or self._closing) and (position == 0 or (write.keys and not write.keys & blocked)):
+                return write
+            if not write.keys:
+                # Writes without keys are ordered with respect to everything
+                return None
+            blocked |= write.keys
+        return None
+
+    def _run(self) -> None:
+        while True:
+            write = self._next()
+            if write is None:
+                return
+            try:
+                write.result = write.func(*write.args, **write.kwargs)
+                write.status = 'done'
+            except Exception as e:
+                write.error = e
+                write.status = 'failed'
@@ -0,0 +1,141 @@
+import bisect
+import concurrent.futures
+from typing import Any, Dict, List, Optional
+
+from .client import TrelloClient, get_default_client
+
+# Trello's /batch endpoint accepts at most 10 routes per call
+BATCH_URL_LIMIT = 10
+DEFAULT_MAX_WORKERS = 8
+# Spacing used for explicit `pos` values so parallel creates keep their order
+POS_STEP = 16384
+
+
+def item_pos(index: int) -> int:
+    """Explicit position for the index-th item of a list or checklist."""
+    return (index + 1) * POS_STEP
+
+
+def plan_positions(current: List[Optional[float]]) -> List[Optional[float]]:
+    """New positions that put items in the given order with as few moves as possible.
+
+    `current` holds each item's existing position, in the wanted order, or
+    None for items that don't exist yet. The longest run of items already in
+    order keeps its positions (None in the result); every other item gets a
+    position spread evenly into the gap where it belongs.
+    """
+    # Longest increasing subsequence of the existing positions
+    tails: List[float] = []
+    tail_indexes: List[int] = []
+    previous: List[Optional[int]] = [None] * len(current)
+    for index, pos in enumerate(current):
+        if pos is None:
+            continue
+        length = bisect.bisect_left(tails, pos)
+        previous[index] = tail_indexes[length - 1] if length else None
+        if length == len(tails):
+            tails.append(pos)
+            tail_indexes.append(index)
+        else:
+            tails[length] = pos
+            tail_indexes[length] = index
+    keep = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        keep.add(index)
+        index = previous[index]
+
+    positions: List[Optional[float]] = [None] * len(current)
+    lower = 0.0
+    start = 0
+    while start < len(current):
+        if start in keep:
+            lower = current[start]
+            start += 1
+            continue
+        end = start
+        while end < len(current) and end not in keep:
+            end += 1
+        upper = current[end] if end < len(current) else lower + (end - start + 1) * POS_STEP
+        step = (upper - lower) / (end - start + 1)
+        for offset in range(end - start):
+            positions[start + offset] = lower + step * (offset + 1)
+        start = end
+    return positions
+
+
+class WriteQueue:
+    """Queue Trello writes and execute them with bounded parallelism.
+
+    Writes start as soon as they are submitted; `flush()` waits for all of
+    them and re-raises the first failure. Ordering between writes is not
+    preserved, so callers that care about order must pass explicit `pos`.
+    """
+
+    def __init__(self, client: Optional[TrelloClient] = None, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.client = client or get_default_client()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._pending: List[concurrent.futures.Future] = []
+
+    def submit(self, method: str, path: str, params: Optional[Dict] = None) -> concurrent.futures.Future:
+        future = self._executor.submit(self._send, method, path, params)
+        self._pending.append(future)
+        return future
+
+    def _send(self, method: str, path: str, params: Optional[Dict]) -> Any:
+        response = self.client.request(method, path, params=params)
+        return response.json() if response.content else None
+
+    def flush(self, return_exceptions: bool = False) -> List[Any]:
+        """Wait for every queued write and return their results in submit order.
+
+        With `return_exceptions`, failures are returned in place of results
+        instead of the first one being raised.
+        """
+        pending, self._pending = self._pending, []
+        concurrent.futures.wait(pending)
+        if return_exceptions:
+            return [future.exception() or future.result() for future in pending]
+        return [future.result() for future in pending]
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'WriteQueue':
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def batch_get(paths: List[str], client: Optional[TrelloClient] = None, max_workers: int = DEFAULT_MAX_WORKERS) -> List[Any]:
+    """Fetch many GET routes through Trello's /batch endpoint.
+
+    Routes are grouped ten per call and the calls run in parallel. Results
+    come back in the order of `paths`; routes that failed yield None.
+    """
+    client = client or get_default_client()
+    chunks = [paths[i:i + BATCH_URL_LIMIT] for i in range(0, len(paths), BATCH_URL_LIMIT)]
+    if not chunks:
+        return []
+
+    def fetch(chunk: List[str]) -> List[Any]:
+        # Routes are comma separated, so commas inside a route (e.g. in a
+        # fields list) have to be escaped
+        urls = ','.join(path.replace(',', '%2C') for path in chunk)
+        responses = client.get('/batch', params={'urls': urls})
+        # Each entry is keyed by its status code, e.g. {"200": {...}}
+        return [entry.get('200') for entry in responses]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        results = []
+        for chunk_results in executor.map(fetch, chunks):
+            results.extend(chunk_results)
+    return results
+
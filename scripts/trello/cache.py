@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from .batch import batch_get
+from .client import TrelloClient, get_default_client
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'trello', 'boards.sqlite3')
+# The board list itself rarely changes, so it is only re-fetched once a day
+BOARDS_TTL = 24 * 60 * 60
+# Trello caps a page of actions at 1000; if a delta is that large we resync
+ACTIONS_PAGE_LIMIT = 1000
+
+CARD_ACTIONS = [
+    'createCard', 'updateCard', 'deleteCard', 'copyCard', 'moveCardToBoard',
+    'moveCardFromBoard', 'convertToCardFromCheckItem', 'emailCard'
+]
+LIST_ACTIONS = ['createList', 'updateList', 'moveListToBoard', 'moveListFromBoard']
+# Only these fields are downloaded and cached for each card
+CARD_FIELDS = 'name,desc,idList,idBoard,pos,closed,dateLastActivity,labels,shortUrl'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lists (
+    id TEXT PRIMARY KEY,
+    board_id TEXT NOT NULL,
+    pos REAL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    board_id TEXT NOT NULL,
+    list_id TEXT NOT NULL,
+    pos REAL,
+    date_last_activity TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cards_by_list ON cards (list_id, pos);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    last_action_id TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class BoardCache:
+    """On-disk cache of boards, open lists and open cards.
+
+    Boards are synced lazily: the first read of a board in a session fetches
+    only the actions since the last sync and re-reads the lists and cards
+    they touched. Reads mirror the TrelloClient method names, so a cache
+    can be passed anywhere a client is used for lookups.
+    """
+
+    def __init__(self, path: Optional[str] = None, client: Optional[TrelloClient] = None):
+        self.path = path or os.getenv('TRELLO_CACHE_PATH') or DEFAULT_CACHE_PATH
+        self.client = client or get_default_client()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+        self._synced_boards = set()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> 'BoardCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_boards(self, refresh: bool = False) -> List[Dict]:
+        """Get all boards, re-fetching them if the cached copy is stale."""
+        state = self._get_state('boards')
+        if refresh or state is None or time.time() - state[1] > BOARDS_TTL:
+            boards = self.client.get_boards()
+            with self.db:
+                self.db.execute('DELETE FROM boards')
+                self.db.executemany(
+                    'INSERT INTO boards (id, data) VALUES (?, ?)',
+                    [(board['id'], json.dumps(board)) for board in boards]
+                )
+                self._set_state('boards', None)
+            return boards
+        return self._load('SELECT data FROM boards')
+
+    def get_board_lists(self, board_id: str) -> List[Dict]:
+        """Get the open lists of a board, in board order."""
+        self._ensure_synced(board_id)
+        return self._load('SELECT data FROM lists WHERE board_id = ? ORDER BY pos', (board_id,))
+
+    def get_board_cards(self, board_id: str) -> List[Dict]:
+        """Get the open cards of a board."""
+        self._ensure_synced(board_id)
+        return self._load('SELECT data FROM cards WHERE board_id = ? ORDER BY list_id, pos', (board_id,))
+
+    def get_list_cards(self, list_id: str, fields: Union[str, List[str], None] = None) -> List[Dict]:
+        """Get the open cards of one list, in list order, optionally only some fields."""
+        row = self.db.execute('SELECT board_id FROM lists WHERE id = ?', (list_id,)).fetchone()
+        if row is None:
+            raise LookupError(f"List {list_id} is not in the cache; read its board's lists first")
+        self._ensure_synced(row[0])
+        cards = self._load('SELECT data FROM cards WHERE list_id = ? ORDER BY pos', (list_id,))
+        if fields:
+            keep = {'id', *(fields.split(',') if isinstance(fields, str) else fields)}
+            cards = [{key: value for key, value in card.items() if key in keep} for card in cards]
+        return cards
+
+    def sync(self, board_id: str) -> int:
+        """Bring a board up to date and return how many changes were applied."""
+        state = self._get_state(f'board:{board_id}')
+        last_action_id = state[0] if state else None
+        if last_action_id is None:
+            changes = self._full_sync(board_id)
+        else:
+            changes = self._delta_sync(board_id, last_action_id)
+        self._synced_boards.add(board_id)
+        return changes
+
+    def _ensure_synced(self, board_id: str) -> None:
+        if board_id not in self._synced_boards:
+            self.sync(board_id)
+
+    def _full_sync(self, board_id: str) -> int:
+        # Read the newest action first so nothing that happens during the
+        # download is missed; replaying it on the next delta is harmless
+        latest = self._get_actions(board_id, limit=1)
+        lists = self.client.get_board_lists(board_id)
+        cards = self.client.get_board_cards(board_id, fields=CARD_FIELDS)
+        with self.db:
+            self.db.execute('DELETE FROM lists WHERE board_id = ?', (board_id,))
+            self.db.execute('DELETE FROM cards WHERE board_id = ?', (board_id,))
+            self._store_lists(board_id, lists)
+            self._store_cards(board_id, cards)
+            self._set_state(f'board:{board_id}', latest[0]['id'] if latest else '')
+        return len(lists) + len(cards)
+
+    def _delta_sync(self, board_id: str, last_action_id: str) -> int:
+        actions = self._get_actions(board_id, since=last_action_id or None, limit=ACTIONS_PAGE_LIMIT)
+        if len(actions) >= ACTIONS_PAGE_LIMIT:
+            return self._full_sync(board_id)
+        if not actions:
+            return 0
+
+        card_ids = list({action['data']['card']['id'] for action in actions
+                         if action['type'] in CARD_ACTIONS and 'card' in action['data']})
+        list_ids = list({action['data']['list']['id'] for action in actions
+                         if action['type'] in LIST_ACTIONS and 'list' in action['data']})
+
+        # Deleted or moved-away objects come back as None (404) or on another
+        # board; closed ones are dropped since only open objects are cached
+        fetched_lists = self._fetch(f'/lists/{list_id}' for list_id in list_ids)
+        fetched_cards = self._fetch(f'/cards/{card_id}?fields={CARD_FIELDS}' for card_id in card_ids)
+        with self.db:
+            for list_id, lst in zip(list_ids, fetched_lists):
+                self.db.execute('DELETE FROM lists WHERE id = ?', (list_id,))
+                if lst and not lst.get('closed') and lst['idBoard'] == board_id:
+                    self._store_lists(board_id, [lst])
+            for card_id, card in zip(card_ids, fetched_cards):
+                self.db.execute('DELETE FROM cards WHERE id = ?', (card_id,))
+                if card and not card.get('closed') and card['idBoard'] == board_id:
+                    self._store_cards(board_id, [card])
+            # Actions are returned newest first
+            self._set_state(f'board:{board_id}', actions[0]['id'])
+        return len(list_ids) + len(card_ids)
+
+    def _get_actions(self, board_id: str, since: Optional[str] = None, limit: int = ACTIONS_PAGE_LIMIT) -> List[Dict]:
+        params = {
+            'filter': ','.join(CARD_ACTIONS + LIST_ACTIONS),
+            'fields': 'type,data,date',
+            'limit': limit
+        }
+        if since:
+            params['since'] = since
+        return self.client.get(f'/boards/{board_id}/actions', params=params)
+
+    def _fetch(self, paths: Iterable[str]) -> List[Optional[Dict]]:
+        return batch_get(list(paths), self.client)
+
+    def _store_lists(self, board_id: str, lists: List[Dict]) -> None:
+        self.db.executemany(
+            'INSERT OR REPLACE INTO lists (id, board_id, pos, data) VALUES (?, ?, ?, ?)',
+            [(lst['id'], board_id, lst.get('pos'), json.dumps(lst)) for lst in lists if not lst.get('closed')]
+        )
+
+    def _store_cards(self, board_id: str, cards: List[Dict]) -> None:
+        self.db.executemany(
+            'INSERT OR REPLACE INTO cards (id, board_id, list_id, pos, date_last_activity, data) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [
+                (card['id'], board_id, card['idList'], card.get('pos'), card.get('dateLastActivity'), json.dumps(card))
+                for card in cards if not card.get('closed')
+            ]
+        )
+
+    def _load(self, query: str, args: tuple = ()) -> List[Dict]:
+        return [json.loads(row[0]) for row in self.db.execute(query, args)]
+
+    def _get_state(self, key: str) -> Optional[tuple]:
+        return self.db.execute('SELECT last_action_id, synced_at FROM sync_state WHERE key = ?', (key,)).fetchone()
+
+    def _set_state(self, key: str, last_action_id: Optional[str]) -> None:
+        self.db.execute(
+            'INSERT OR REPLACE INTO sync_state (key, last_action_id, synced_at) VALUES (?, ?, ?)',
+            (key, last_action_id, time.time())
+        )
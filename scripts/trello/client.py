@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional, Union
+
+from .instrument import record_attempt
+from .ratelimit import RequestStats, RetryPolicy, TokenBucket, parse_retry_after, rewind_files
+
+BASE_URL = 'https://api.trello.com/1'
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 30
+# Everything shown in a card's detail view, fetched in one request;
+# comments are the card's commentCard actions
+CARD_DETAIL_PARAMS = {
+    'attachments': 'true',
+    'actions': 'commentCard',
+    'checklists': 'all'
+}
+
+
+def fields_param(fields: Union[str, List[str], None]) -> Dict:
+    """Query params projecting a response onto `fields`, if given."""
+    if not fields:
+        return {}
+    return {'fields': fields if isinstance(fields, str) else ','.join(fields)}
+
+
+class TrelloClient:
+    """Trello REST client backed by a single keep-alive HTTP session.
+
+    Requests are paced by a token bucket and 429s/transient failures are
+    retried according to `retry_policy`; counters are kept in `stats`.
+    """
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        token: Optional[str] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        base_url: Optional[str] = None,
+        limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        self.base_url = (base_url or os.getenv('TRELLO_API_URL') or BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.limiter = limiter or TokenBucket()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.stats = RequestStats()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Auth params are merged into every request made through the session
+        self.session.params = {
+            'key': key or os.getenv("TRELLO_KEY"),
+            'token': token or os.getenv("TRELLO_TOKEN")
+        }
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request to the Trello API, retrying and raising on HTTP errors."""
+        kwargs.setdefault('timeout', self.timeout)
+        url = f'{self.base_url}{path}'
+        attempt = 0
+        while True:
+            self.stats.record(requests=1, wait_seconds=self.limiter.acquire())
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                record_attempt('trello', method, path, None, 0, started, attempt, e)
+                if not self.retry_policy.should_retry(method, attempt):
+                    self.stats.record(failed=1)
+                    raise
+                delay = self.retry_policy.delay(attempt)
+            else:
+                status = response.status_code
+                record_attempt('trello', method, path, status, len(response.content), started, attempt)
+                if status == 429:
+                    self.stats.record(throttled=1)
+                if status < 400 or not self.retry_policy.should_retry(method, attempt, status):
+                    if status >= 400:
+                        self.stats.record(failed=1)
+                    response.raise_for_status()
+                    return response
+                delay = self.retry_policy.delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                if status == 429:
+                    # Back off every thread sharing this client, not just this one
+                    self.limiter.pause(delay)
+            self.stats.record(retried=1)
+            rewind_files(kwargs.get('files'))
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, path: str, params: Optional[Dict] = None) -> Any:
+        return self.request('GET', path, params=params).json()
+
+    def post(self, path: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        return self.request('POST', path, params=params, **kwargs).json()
+
+    def put(self, path: str, params: Optional[Dict] = None) -> Any:
+        return self.request('PUT', path, params=params).json()
+
+    def delete(self, path: str, params: Optional[Dict] = None) -> None:
+        self.request('DELETE', path, params=params)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'TrelloClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_boards(self) -> List[Dict]:
+        """Get all Trello boards for the authenticated user."""
+        return self.get('/members/me/boards')
+
+    def get_board_cards(self, board_id: str, fields: Union[str, List[str], None] = None) -> List[Dict]:
+        """Get all cards from a specific board."""
+        return self.get(f'/boards/{board_id}/cards', params=fields_param(fields))
+
+    def get_list_cards(self, list_id: str, fields: Union[str, List[str], None] = None) -> List[Dict]:
+        """Get the open cards of a single list, optionally only some fields."""
+        return self.get(f'/lists/{list_id}/cards', params=fields_param(fields))
+
+    def get_board_lists(self, board_id: str) -> List[Dict]:
+        """Get all lists from a specific board."""
+        return self.get(f'/boards/{board_id}/lists')
+
+    def get_card(self, card_id: str) -> Dict:
+        """Get full details of a card including attachments, comments and checklists."""
+        return self.get(f'/cards/{card_id}', params=CARD_DETAIL_PARAMS)
+
+    def move_card(self, card_id: str, list_id: str) -> Dict:
+        """Move a card to a different list."""
+        return self.put(f'/cards/{card_id}', params={'idList': list_id})
+
+    def update_card_description(self, card_id: str, description: str) -> None:
+        """Update a card's description."""
+        self.put(f'/cards/{card_id}', params={'desc': description})
+
+    def delete_card(self, card_id: str) -> None:
+        """Delete a card."""
+        self.delete(f'/cards/{card_id}')
+
+    def close_list(self, list_id: str) -> None:
+        """Archive/close a list."""
+        self.put(f'/lists/{list_id}/closed', params={'value': 'true'})
+
+
+_default_client: Optional[TrelloClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> TrelloClient:
+    """Return the shared client, creating it on first use.
+
+    Creation is deferred so that scripts can call load_dotenv() after
+    importing the package and still have TRELLO_KEY/TRELLO_TOKEN picked up.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = TrelloClient()
+        return _default_client
+
+
+def set_default_client(client: Optional[TrelloClient]) -> None:
+    """Replace the shared client, e.g. to change pool size or timeouts."""
+    global _default_client
+    _default_client = client
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Optional, Tuple, Type
+
+from .instrument import RequestEvent
+
+# Statuses meaning the service is overloaded rather than the request being wrong
+CONGESTION_STATUSES = {429, 503}
+# Smoothed latency above this multiple of the baseline counts as queueing
+DEFAULT_LATENCY_TOLERANCE = 2.0
+# Multiplicative decreases for a rejection and for inflated latency
+BACKOFF_FACTOR = 0.5
+LATENCY_BACKOFF_FACTOR = 0.9
+# Weight of a new sample in the smoothed latency
+LATENCY_SMOOTHING = 0.2
+# The baseline is the lowest smoothed latency of this many recent seconds, so
+# it follows a lasting change in the service's speed but not queueing
+BASELINE_WINDOW = 30.0
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit for one backend, used as `async with limit:`.
+
+    The limit grows by one per successful request until the first sign of
+    congestion (slow start), and by one per limit's worth of successes after
+    that. A 429/503 or a timeout halves it, and smoothed latency well above
+    the best of the last BASELINE_WINDOW seconds shrinks it slightly and
+    stops it from growing; at most one decrease applies per round trip, so a
+    burst of rejections counts as one signal.
+
+    Outcomes come from instrument events: register the limit with
+    trello.add_hook and it follows every request of its `service`, or only
+    those sent by `client` when that is set. Exceptions in `timeout_errors`
+    raised inside the block also count, for clients whose timeouts never
+    reach an event hook.
+    """
+
+    def __init__(self, service: str, maximum: int, initial: int = 4, minimum: int = 1,
+                 latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+                 timeout_errors: Tuple[Type[BaseException], ...] = (), client: Any = None):
+        self.service = service
+        self.client = client
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.latency_tolerance = latency_tolerance
+        self.timeout_errors = timeout_errors
+        self.in_flight = 0
+        self.peak = self.limit
+        self.decreases = 0
+        self.baseline: Optional[float] = None
+        self._slow_start = True
+        self._smoothed_latency = 0.0
+        # (time, smoothed latency) samples with increasing latency; the first
+        # is the minimum of the window
+        self._window: Deque[Tuple[float, float]] = deque()
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> 'AdaptiveConcurrency':
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc is not None and isinstance(exc, self.timeout_errors):
+            self.decrease(BACKOFF_FACTOR)
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def __call__(self, event: RequestEvent) -> None:
+        if event.service != self.service or (self.client is not None and event.client is not self.client):
+            return
+        if event.status is None or event.status in CONGESTION_STATUSES:
+            self.decrease(BACKOFF_FACTOR)
+        elif event.status < 500:
+            self.observe_latency(event.duration)
+
+    def observe_latency(self, duration: float) -> None:
+        """Grow the limit after a success, or shrink it if latency shows queueing."""
+        now = time.monotonic()
+        if self.baseline is None:
+            self._smoothed_latency = duration
+        self._smoothed_latency += (duration - self._smoothed_latency) * LATENCY_SMOOTHING
+        while self._window and self._window[-1][1] >= self._smoothed_latency:
+            self._window.pop()
+        self._window.append((now, self._smoothed_latency))
+        while self._window[0][0] < now - BASELINE_WINDOW:
+            self._window.popleft()
+        self.baseline = self._window[0][1]
+        if self._smoothed_latency > self.latency_tolerance * self.baseline:
+            # Requests are queueing, so a bigger limit would only add to the queue
+            self.decrease(LATENCY_BACKOFF_FACTOR)
+            return
+        self.limit = min(self.maximum, self.limit + (1 if self._slow_start else 1 / self.limit))
+        self.peak = max(self.peak, self.limit)
+
+    def decrease(self, factor: float) -> bool:
+        """Multiply the limit by `factor` unless it was already cut this round trip."""
+        now = time.monotonic()
+        if now - self._last_decrease < self._smoothed_latency:
+            return False
+        self._last_decrease = now
+        self._slow_start = False
+        self.limit = max(self.minimum, self.limit * factor)
+        self.decreases += 1
+        return True
+
+    def __str__(self) -> str:
+        return (
+            f"{self.service} concurrency ended at {int(self.limit)} of at most {self.maximum} "
+            f"(peak {int(self.peak)}, {self.decreases} decreases)"
+        )
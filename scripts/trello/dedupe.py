@@ -0,0 +1,148 @@
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+# Estimated Jaccard similarity of two cards' shingles above which they are near-duplicates
+DEFAULT_THRESHOLD = 0.8
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+# LSH bands are as narrow as possible while a pair exactly at the threshold
+# still shares at least one band this often
+CANDIDATE_RECALL = 0.99
+NON_WORD = re.compile(r'\W+')
+# Shingles hashed per NumPy call when computing many signatures at once
+HASH_CHUNK = 32768
+
+
+def card_text(card: Dict) -> str:
+    return f"{card.get('name', '')}\n{card.get('desc') or ''}"
+
+
+def shingles(text: str) -> np.ndarray:
+    """Distinct byte 5-grams of the lowercased text with punctuation collapsed, packed into integers."""
+    data = np.frombuffer(NON_WORD.sub(' ', text.lower()).strip().encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+    if len(data) == 0:
+        return data
+    if len(data) < SHINGLE_SIZE:
+        data = np.pad(data, (0, SHINGLE_SIZE - len(data)), constant_values=32)
+    packed = np.zeros(len(data) - SHINGLE_SIZE + 1, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        packed |= data[offset:len(packed) + offset] << np.uint64(8 * offset)
+    return np.unique(packed)
+
+
+def band_rows(threshold: float, num_perm: int = NUM_PERM) -> int:
+    """Signature rows per LSH band for near-duplicates at `threshold`."""
+    rows = 1
+    while rows < num_perm:
+        bands = num_perm // (rows + 1)
+        if 1 - (1 - threshold ** (rows + 1)) ** bands < CANDIDATE_RECALL:
+            break
+        rows += 1
+    return rows
+
+
+class DuplicateIndex:
+    """MinHash signatures with LSH buckets, clustering near-duplicate texts.
+
+    add() only compares a text with earlier ones that share an LSH band
+    (a run of signature rows), so indexing n texts takes roughly linear
+    time rather than n² comparisons. Clusters are kept in a union-find
+    whose root is always the earliest text of the cluster.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = band_rows(threshold, num_perm)
+        self.bands = num_perm // self.rows
+        generator = np.random.default_rng(seed)
+        # Multiply-shift hashing with random odd multipliers; uint64 arithmetic
+        # wraps, which is part of the scheme
+        self._multipliers = generator.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._keys: List[Hashable] = []
+        self._order: Dict[Hashable, int] = {}
+        self._parent: List[int] = []
+        self._signatures: List[Optional[np.ndarray]] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+
+    def signatures(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """MinHash signature of each text, or None for texts without shingles.
+
+        The shingles of many texts are hashed together, since per-text NumPy
+        calls on a few dozen shingles are dominated by call overhead.
+        """
+        result: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending, pending_shingles, size = [], [], 0
+        for position, text in enumerate(texts):
+            values = shingles(text)
+            if len(values):
+                pending.append(position)
+                pending_shingles.append(values)
+                size += len(values)
+            if pending and (size >= HASH_CHUNK or position == len(texts) - 1):
+                starts = np.cumsum([0] + [len(values) for values in pending_shingles[:-1]])
+                with np.errstate(over='ignore'):
+                    products = self._multipliers[:, None] * np.concatenate(pending_shingles)[None, :]
+                # The hash is the product's top 32 bits; shifting is monotonic, so take the minimum first
+                minimums = (np.minimum.reduceat(products, starts, axis=1) >> np.uint64(32)).astype(np.uint32)
+                for column, target in enumerate(pending):
+                    result[target] = minimums[:, column]
+                pending, pending_shingles, size = [], [], 0
+        return result
+
+    def _find(self, index: int) -> int:
+        while self._parent[index] != index:
+            self._parent[index] = self._parent[self._parent[index]]
+            index = self._parent[index]
+        return index
+
+    def add(self, key: Hashable, text: str) -> Hashable:
+        """Index `text` under `key`, returning the key of its cluster's earliest text."""
+        return self.add_many([key], [text])[0]
+
+    def add_many(self, keys: Sequence[Hashable], texts: Sequence[str]) -> List[Hashable]:
+        """Index several texts in order, returning the cluster key of each."""
+        return [self._add(key, signature) for key, signature in zip(keys, self.signatures(texts))]
+
+    def _add(self, key: Hashable, signature: Optional[np.ndarray]) -> Hashable:
+        index = len(self._keys)
+        self._keys.append(key)
+        self._order[key] = index
+        self._parent.append(index)
+        self._signatures.append(signature)
+        # Empty cards are never duplicates of each other
+        if signature is None:
+            return key
+
+        compared = set()
+        for band, buckets in enumerate(self._buckets):
+            bucket = buckets[signature[band * self.rows:(band + 1) * self.rows].tobytes()]
+            for other in bucket:
+                root, other_root = self._find(index), self._find(other)
+                if root == other_root or other in compared:
+                    continue
+                compared.add(other)
+                if np.mean(signature == self._signatures[other]) >= self.threshold:
+                    self._parent[max(root, other_root)] = min(root, other_root)
+            bucket.append(index)
+        return self._keys[self._find(index)]
+
+    def representative(self, key: Hashable) -> Hashable:
+        return self._keys[self._find(self._order[key])]
+
+    def clusters(self) -> List[List[Hashable]]:
+        """Keys grouped by cluster, in the order they were added."""
+        groups: Dict[int, List[Hashable]] = defaultdict(list)
+        for index, key in enumerate(self._keys):
+            groups[self._find(index)].append(key)
+        return list(groups.values())
+
+
+def cluster_cards(cards: List[Dict], threshold: float = DEFAULT_THRESHOLD, text: Callable[[Dict], str] = card_text) -> List[List[Dict]]:
+    """Group near-duplicate cards, keeping the order of the first card of each group."""
+    index = DuplicateIndex(threshold)
+    index.add_many(range(len(cards)), [text(card) for card in cards])
+    return [[cards[position] for position in cluster] for cluster in index.clusters()]
@@ -0,0 +1,71 @@
+import concurrent.futures
+from typing import Any, Callable, List, Optional
+
+from .batch import DEFAULT_MAX_WORKERS
+
+
+class Task:
+    """One node of a TaskGraph; `result` is set once it has run."""
+
+    def __init__(self, func: Callable[..., Any], args: tuple, kwargs: dict, after: Optional['Task']):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.after = after
+        self.children: List['Task'] = []
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> Any:
+        if self.after is None:
+            return self.func(*self.args, **self.kwargs)
+        # Dependent writes need the id of the object their parent created
+        return self.func(self.after.result['id'], *self.args, **self.kwargs)
+
+
+class TaskGraph:
+    """Run Trello writes as a dependency tree with bounded parallelism.
+
+    A task added with `after=parent` starts once the parent has finished and
+    receives the id of the object the parent created as its first argument,
+    e.g. a card created after its list. Independent tasks run concurrently,
+    so callers that care about order must pass explicit `pos`.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.tasks: List[Task] = []
+
+    def add(self, func: Callable[..., Any], *args, after: Optional[Task] = None, **kwargs) -> Task:
+        task = Task(func, args, kwargs, after)
+        if after is not None:
+            after.children.append(task)
+        self.tasks.append(task)
+        return task
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def run(self, on_done: Optional[Callable[[Task], None]] = None) -> List[Task]:
+        """Run every task and return those that failed.
+
+        Tasks whose parent failed are skipped and are not reported.
+        `on_done` is called from this thread after each task finishes.
+        """
+        failed = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {executor.submit(task.run): task for task in self.tasks if task.after is None}
+            while running:
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    task.error = future.exception()
+                    if task.error is not None:
+                        failed.append(task)
+                    else:
+                        task.result = future.result()
+                        for child in task.children:
+                            running[executor.submit(child.run)] = child
+                    if on_done:
+                        on_done(task)
+        return failed
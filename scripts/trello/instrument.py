@@ -0,0 +1,240 @@
+import atexit
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Trello object ids are 24 hex digits
+ID_PATTERN = re.compile(r'/[0-9a-f]{24}(?=/|$)')
+
+
+class RequestEvent:
+    """One HTTP attempt: a retried request emits one event per attempt.
+
+    `client` is the object that sent the request, when known, so hooks can
+    tell apart clients of the same service.
+    """
+
+    __slots__ = ('service', 'method', 'endpoint', 'status', 'bytes', 'duration', 'attempt', 'error', 'client')
+
+    def __init__(self, service: str, method: str, endpoint: str, status: Optional[int], bytes: int,
+                 duration: float, attempt: int = 0, error: Optional[str] = None, client: Any = None):
+        self.service = service
+        self.method = method
+        self.endpoint = endpoint
+        self.status = status
+        self.bytes = bytes
+        self.duration = duration
+        self.attempt = attempt
+        self.error = error
+        self.client = client
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'client'}
+
+
+Hook = Callable[[RequestEvent], None]
+_hooks: List[Hook] = []
+
+
+def add_hook(hook: Hook) -> None:
+    """Call `hook` with every RequestEvent; hooks run on the requesting thread and must not raise."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    _hooks.remove(hook)
+
+
+def emit(event: RequestEvent) -> None:
+    for hook in list(_hooks):
+        hook(event)
+
+
+def record_attempt(service: str, method: str, path: str, status: Optional[int], size: int,
+                   started: float, attempt: int, error: Optional[BaseException] = None, client: Any = None) -> None:
+    """Emit the event for one attempt that began at perf_counter() `started`."""
+    if _hooks:
+        emit(RequestEvent(
+            service, method, normalize_endpoint(path), status, size, time.perf_counter() - started,
+            attempt, type(error).__name__ if error else None, client
+        ))
+
+
+def normalize_endpoint(path: str) -> str:
+    """Strip the query and replace object ids so requests group by endpoint."""
+    return ID_PATTERN.sub('/{id}', path.split('?', 1)[0])
+
+
+def httpx_event_hooks(service: str) -> Dict[str, List[Callable]]:
+    """Event hooks that emit a RequestEvent for every request of an httpx.AsyncClient.
+
+    Retries made by the OpenAI SDK are counted from its retry-count header.
+    """
+
+    async def on_request(request) -> None:
+        request.extensions['instrument_started'] = time.perf_counter()
+
+    async def on_response(response) -> None:
+        if not _hooks:
+            return
+        await response.aread()
+        request = response.request
+        started = request.extensions.get('instrument_started', time.perf_counter())
+        emit(RequestEvent(
+            service, request.method, normalize_endpoint(request.url.path), response.status_code,
+            len(response.content), time.perf_counter() - started,
+            int(request.headers.get('x-stainless-retry-count', 0))
+        ))
+
+    return {'request': [on_request], 'response': [on_response]}
+
+
+class EndpointStats:
+    def __init__(self):
+        self.durations: List[float] = []
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.statuses: Dict[str, int] = defaultdict(int)
+        self.retries = 0
+        self.errors = 0
+        self.bytes = 0
+
+    def add(self, event: RequestEvent) -> None:
+        self.durations.append(event.duration)
+        self.buckets[next((i for i, bound in enumerate(LATENCY_BUCKETS) if event.duration <= bound), -1)] += 1
+        self.statuses[str(event.status) if event.status is not None else 'error'] += 1
+        self.retries += event.attempt > 0
+        self.errors += event.status is None or event.status >= 400
+        self.bytes += event.bytes
+
+    def percentile(self, q: float) -> float:
+        durations = sorted(self.durations)
+        return durations[min(len(durations) - 1, int(q * len(durations)))] if durations else 0.0
+
+
+class Profiler:
+    """Hook aggregating request events per (service, method, endpoint)."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints: Dict[Tuple[str, str, str], EndpointStats] = defaultdict(EndpointStats)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.endpoints[(event.service, event.method, event.endpoint)].add(event)
+
+    def _sorted(self) -> List[Tuple[Tuple[str, str, str], EndpointStats]]:
+        with self._lock:
+            return sorted(self.endpoints.items(), key=lambda item: -sum(item[1].durations))
+
+    def report(self) -> str:
+        """Per-endpoint calls, retries, errors, latency percentiles and histogram."""
+        rows = self._sorted()
+        if not rows:
+            return "No HTTP requests were made"
+        calls = sum(len(stats.durations) for _, stats in rows)
+        retries = sum(stats.retries for _, stats in rows)
+        lines = [
+            f"HTTP profile: {calls} calls, {retries} retries, {sum(sum(stats.durations) for _, stats in rows):.2f}s in requests",
+            f"{'endpoint':<44} {'calls':>6} {'retry':>5} {'err':>4} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'total s':>8} {'KiB':>8}"
+        ]
+        for (service, method, endpoint), stats in rows:
+            lines.append(
+                f"{f'{service} {method} {endpoint}':<44.44} {len(stats.durations):>6} {stats.retries:>5} {stats.errors:>4} "
+                f"{stats.percentile(0.5) * 1000:>7.1f} {stats.percentile(0.95) * 1000:>7.1f} {max(stats.durations) * 1000:>7.1f} "
+                f"{sum(stats.durations):>8.2f} {stats.bytes / 1024:>8.1f}"
+            )
+        labels = [f'{bound * 1000:g}ms' if bound < 1 else f'{bound:g}s' for bound in LATENCY_BUCKETS] + ['more']
+        lines.append("")
+        lines.append(f"{'latency histogram (calls up to)':<44} " + ' '.join(f'{label:>6}' for label in labels))
+        for (service, method, endpoint), stats in rows:
+            lines.append(f"{f'{service} {method} {endpoint}':<44.44} " + ' '.join(f'{count:>6}' for count in stats.buckets))
+        return '\n'.join(lines)
+
+    def as_dict(self) -> Dict:
+        return {
+            'started': self.started,
+            'endpoints': [
+                {
+                    'service': service,
+                    'method': method,
+                    'endpoint': endpoint,
+                    'calls': len(stats.durations),
+                    'retries': stats.retries,
+                    'errors': stats.errors,
+                    'statuses': dict(stats.statuses),
+                    'bytes': stats.bytes,
+                    'total_seconds': sum(stats.durations),
+                    'p50_seconds': stats.percentile(0.5),
+                    'p95_seconds': stats.percentile(0.95),
+                    'max_seconds': max(stats.durations),
+                    'buckets': dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ['+Inf'], stats.buckets))
+                }
+                for (service, method, endpoint), stats in self._sorted()
+            ]
+        }
+
+    def to_openmetrics(self) -> str:
+        """The profile in the OpenMetrics text format."""
+        requests, retries, sizes, histogram = [], [], [], []
+        for (service, method, endpoint), stats in self._sorted():
+            labels = f'service="{service}",method="{method}",endpoint="{endpoint}"'
+            for status, count in sorted(stats.statuses.items()):
+                requests.append(f'http_client_requests_total{{{labels},status="{status}"}} {count}')
+            retries.append(f'http_client_retries_total{{{labels}}} {stats.retries}')
+            sizes.append(f'http_client_response_bytes_total{{{labels}}} {stats.bytes}')
+            cumulative = 0
+            for bound, count in zip([str(bound) for bound in LATENCY_BUCKETS] + ['+Inf'], stats.buckets):
+                cumulative += count
+                histogram.append(f'http_client_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            histogram.append(f'http_client_request_duration_seconds_count{{{labels}}} {len(stats.durations)}')
+            histogram.append(f'http_client_request_duration_seconds_sum{{{labels}}} {sum(stats.durations)}')
+        return '\n'.join(
+            ['# TYPE http_client_requests counter'] + requests
+            + ['# TYPE http_client_retries counter'] + retries
+            + ['# TYPE http_client_response_bytes counter'] + sizes
+            + ['# TYPE http_client_request_duration_seconds histogram', '# UNIT http_client_request_duration_seconds seconds'] + histogram
+            + ['# EOF']
+        ) + '\n'
+
+    def dump(self, path: str) -> None:
+        """Write the profile as OpenMetrics text for .prom/.txt files, JSON otherwise."""
+        with open(path, 'w') as f:
+            if path.endswith(('.prom', '.txt')):
+                f.write(self.to_openmetrics())
+            else:
+                json.dump(self.as_dict(), f, indent=2)
+
+
+def enable_profiling(report: bool = True, path: Optional[str] = None) -> Profiler:
+    """Profile every request from now on and print and/or dump the result at exit."""
+    profiler = Profiler()
+    add_hook(profiler)
+
+    def finish() -> None:
+        if report:
+            print(f"\n{profiler.report()}")
+        if path:
+            profiler.dump(path)
+            print(f"Profile written to {path}")
+
+    atexit.register(finish)
+    return profiler
+
+
+def add_profile_arguments(parser) -> None:
+    """Add the --profile and --profile-out options shared by the scripts."""
+    parser.add_argument('--profile', action='store_true', help='Print per-endpoint request counts, retries and latencies at exit')
+    parser.add_argument('--profile-out', help='Write the request profile to this file (OpenMetrics for .prom/.txt, otherwise JSON)')
+
+
+def enable_profiling_from_args(args) -> Optional[Profiler]:
+    """Enable profiling if the script was run with --profile or --profile-out."""
+    if not (args.profile or args.profile_out):
+        return None
+    return enable_profiling(args.profile, args.profile_out)
@@ -0,0 +1,53 @@
+import concurrent.futures
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_WORKERS = 4
+
+
+class Prefetcher:
+    """Fetch values ahead of time on a thread pool into a bounded LRU.
+
+    prefetch() starts fetching keys in the background; get() returns the
+    value, waiting only if its fetch hasn't finished yet. Failed fetches are
+    not cached, so the next get() tries again.
+    """
+
+    def __init__(self, fetch: Callable[[str], Any], max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
+        self.fetch = fetch
+        self.max_entries = max_entries
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._entries: 'OrderedDict[str, concurrent.futures.Future]' = OrderedDict()
+
+    def prefetch(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._future(key)
+
+    def get(self, key: str) -> Any:
+        future = self._future(key)
+        try:
+            return future.result()
+        except Exception:
+            self._entries.pop(key, None)
+            raise
+
+    def _future(self, key: str) -> concurrent.futures.Future:
+        future = self._entries.get(key)
+        if future is None:
+            future = self._executor.submit(self.fetch, key)
+            self._entries[key] = future
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> 'Prefetcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Trello allows 100 requests per 10 seconds per token. A bucket refilling at
+# 8 req/s with room for a burst of 20 can never exceed 100 in any 10s window.
+# TRELLO_RATE_LIMIT overrides the rate, e.g. when running against a local server.
+DEFAULT_RATE = 8.0
+DEFAULT_BURST = 20
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing requests below the Trello rate limit.
+
+    Callers reserve a token up front and sleep for however long the bucket
+    says, which lets the same bucket pace both threads and coroutines.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: int = DEFAULT_BURST):
+        self.rate = rate or float(os.getenv('TRELLO_RATE_LIMIT') or DEFAULT_RATE)
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`, e.g. after a 429 response."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def acquire(self) -> float:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class RequestStats:
+    """Thread-safe counters describing how requests were paced and retried."""
+
+    def __init__(self):
+        self.requests = 0
+        self.throttled = 0
+        self.retried = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'retried': self.retried,
+                'failed': self.failed,
+                'wait_seconds': round(self.wait_seconds, 3)
+            }
+
+    def __str__(self) -> str:
+        stats = self.as_dict()
+        return (
+            f"{stats['requests']} requests, {stats['throttled']} throttled (429), "
+            f"{stats['retried']} retried, {stats['failed']} failed, "
+            f"{stats['wait_seconds']}s spent pacing"
+        )
+
+
+class RetryPolicy:
+    """Decides which failed requests to retry and how long to back off.
+
+    429s are always retried since Trello rejected the request without acting
+    on it; server errors and transport failures only for idempotent methods.
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None) -> bool:
+        """Return whether to retry; `status` is None for transport errors."""
+        if attempt >= self.max_retries:
+            return False
+        if status == 429:
+            return True
+        if status is not None and status not in RETRYABLE_STATUSES:
+            return False
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before the next attempt, using full jitter."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def rewind_files(files: Optional[Dict]) -> None:
+    """Seek multipart file objects back to the start before resending them."""
+    for value in (files or {}).values():
+        fileobj = value[1] if isinstance(value, tuple) else value
+        if hasattr(fileobj, 'seek'):
+            fileobj.seek(0)
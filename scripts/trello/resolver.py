@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .cache import BoardCache
+from .client import get_default_client
+
+DEFAULT_TTL = 300
+
+
+class AmbiguousNameError(LookupError):
+    """Raised when a name matches more than one board or list."""
+
+
+class NameResolver:
+    """Case-insensitive name to id lookups for boards and lists.
+
+    `source` is anything with get_boards()/get_board_lists(), i.e. a
+    TrelloClient or a BoardCache. Each index is built with one call and
+    reused until `ttl` seconds have passed. With a BoardCache, a board name
+    that is not found is looked up once more in a freshly fetched board
+    list, since the cache keeps boards for much longer than the resolver.
+    """
+
+    def __init__(self, source=None, ttl: float = DEFAULT_TTL):
+        self.source = source or get_default_client()
+        self.ttl = ttl
+        self._indexes: Dict[str, Tuple[float, Dict[str, List[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve_board(self, name: str) -> str:
+        """Return the id of the board called `name`."""
+        try:
+            return self._lookup('boards', 'board', name, self.source.get_boards)
+        except AmbiguousNameError:
+            raise
+        except LookupError:
+            if not isinstance(self.source, BoardCache):
+                raise
+            # The board may have been created or renamed since it was cached
+            with self._lock:
+                self._indexes.pop('boards', None)
+            return self._lookup('boards', 'board', name, lambda: self.source.get_boards(refresh=True))
+
+    def resolve_list(self, board: str, name: str) -> str:
+        """Return the id of list `name` on `board`, given as a board id or name."""
+        board_id = board if self._is_board_id(board) else self.resolve_board(board)
+        return self._lookup(f'lists:{board_id}', 'list', name, lambda: self.source.get_board_lists(board_id))
+
+    def invalidate(self, board_id: Optional[str] = None) -> None:
+        """Forget the list index of one board, or every index if none is given."""
+        with self._lock:
+            if board_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(f'lists:{board_id}', None)
+
+    def _is_board_id(self, board: str) -> bool:
+        index = self._index('boards', self.source.get_boards)
+        return any(board in ids for ids in index.values())
+
+    def _lookup(self, key: str, kind: str, name: str, fetch) -> str:
+        ids = self._index(key, fetch).get(name.strip().lower(), [])
+        if not ids:
+            raise LookupError(f"No {kind} named '{name}'")
+        if len(ids) > 1:
+            raise AmbiguousNameError(f"{len(ids)} {kind}s are named '{name}': {', '.join(ids)}")
+        return ids[0]
+
+    def _index(self, key: str, fetch) -> Dict[str, List[str]]:
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
+            index: Dict[str, List[str]] = {}
+            for item in fetch():
+                index.setdefault(item['name'].strip().lower(), []).append(item['id'])
+            self._indexes[key] = (time.monotonic() + self.ttl, index)
+            return index
+
@@ -0,0 +1,58 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .client import TrelloClient, get_default_client
+
+SNAPSHOT_PARAMS = {
+    'fields': 'name',
+    'lists': 'open',
+    'list_fields': 'name,pos',
+    'cards': 'open',
+    'card_fields': 'name,desc,idList,pos',
+    'card_attachments': 'true',
+    'card_attachment_fields': 'name,url',
+    'checklists': 'all'
+}
+
+
+class BoardSnapshot:
+    """Indexed in-memory view of a board's open lists, cards and checklists."""
+
+    def __init__(self, board: Dict):
+        self.id = board['id']
+        self.name = board.get('name')
+        self.lists: List[Dict] = sorted(board.get('lists', []), key=lambda lst: lst['pos'])
+        self.cards: List[Dict] = sorted(board.get('cards', []), key=lambda card: card['pos'])
+        self.lists_by_id = {lst['id']: lst for lst in self.lists}
+        self.cards_by_id = {card['id']: card for card in self.cards}
+        self.cards_by_list: Dict[str, List[Dict]] = defaultdict(list)
+        for card in self.cards:
+            self.cards_by_list[card['idList']].append(card)
+        self.checklists_by_card: Dict[str, List[Dict]] = defaultdict(list)
+        for checklist in sorted(board.get('checklists', []), key=lambda cl: cl['pos']):
+            checklist['checkItems'] = sorted(checklist.get('checkItems', []), key=lambda item: item['pos'])
+            self.checklists_by_card[checklist['idCard']].append(checklist)
+
+    def find_list(self, name: str) -> Optional[Dict]:
+        """Return the first open list with the given name, if any."""
+        return next((lst for lst in self.lists if lst['name'] == name), None)
+
+    def list_cards(self, list_id: str) -> List[Dict]:
+        """Cards in a list, in board order."""
+        return self.cards_by_list.get(list_id, [])
+
+    def card_checklists(self, card_id: str) -> List[Dict]:
+        """Checklists on a card, with their items, in board order."""
+        return self.checklists_by_card.get(card_id, [])
+
+    def add_list(self, lst: Dict) -> None:
+        """Record a list created after the snapshot was taken."""
+        self.lists.append(lst)
+        self.lists.sort(key=lambda item: item['pos'])
+        self.lists_by_id[lst['id']] = lst
+
+
+def get_board_snapshot(board_id: str, client: Optional[TrelloClient] = None) -> BoardSnapshot:
+    """Fetch lists, cards, attachments and checklists of a board in one request."""
+    client = client or get_default_client()
+    return BoardSnapshot(client.get(f'/boards/{board_id}', params=SNAPSHOT_PARAMS))